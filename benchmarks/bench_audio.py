@@ -0,0 +1,65 @@
+"""볼륨 트랜스포머 마이크로 벤치마크 (초당 처리 프레임 수)
+
+사용법: python benchmarks/bench_audio.py [프레임 수]
+"""
+from __future__ import annotations
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord
+import numpy as np
+
+from utils.audio import FRAME_SAMPLES, CrossfadeSource, NumpyVolumeTransformer
+
+
+class _StaticSource(discord.AudioSource):
+    """같은 20ms PCM 프레임을 정해진 횟수만큼 반환"""
+
+    def __init__(self, frames: int, seed: int = 0) -> None:
+        rng = np.random.default_rng(seed)
+        self._frame = rng.integers(-20000, 20000, FRAME_SAMPLES, dtype=np.int16).tobytes()
+        self._left = frames
+
+    def read(self) -> bytes:
+        if self._left <= 0:
+            return b""
+        self._left -= 1
+        return self._frame
+
+
+def _measure(name: str, source: discord.AudioSource, frames: int) -> None:
+    start = time.perf_counter()
+    count = 0
+    while source.read():
+        count += 1
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else float("inf")
+    # 실시간 재생은 초당 50프레임
+    print(f"{name:<28} {rate:>12,.0f} frames/s  ({rate / 50:,.0f}x 실시간)")
+
+
+def main() -> None:
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    print(f"{frames:,} 프레임 처리")
+    try:
+        _measure("PCMVolumeTransformer", discord.PCMVolumeTransformer(_StaticSource(frames), volume=0.5), frames)
+    except Exception as e:  # audioop이 없는 Python 3.13+ 등
+        print(f"PCMVolumeTransformer         측정 불가: {e}")
+    _measure("NumpyVolumeTransformer", NumpyVolumeTransformer(_StaticSource(frames), volume=0.5), frames)
+    _measure("NumpyVolumeTransformer(x4)", NumpyVolumeTransformer(_StaticSource(frames), volume=4.0), frames)
+    _measure(
+        "CrossfadeSource",
+        CrossfadeSource(
+            NumpyVolumeTransformer(_StaticSource(frames), volume=0.5),
+            NumpyVolumeTransformer(_StaticSource(frames, seed=1), volume=0.5),
+            frames,
+        ),
+        frames,
+    )
+
+
+if __name__ == "__main__":
+    main()
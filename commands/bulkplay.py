@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import re
+import discord
+from utils import embed_error, embed_success
+from utils.constants import BULK_RESOLVE_CONCURRENCY
+from utils.guild_queue import QueueFullError
+from utils.sources import YTDLSource
+from .play import ensure_voice
+logger = logging.getLogger(__name__)
+QUERY_SEPARATOR = re.compile(r"[;\n]")
+@discord.slash_command(name="여러곡재생", description="여러 곡을 한 번에 대기열에 추가합니다 (; 로 구분)")
+async def bulk_play(
+    ctx: discord.ApplicationContext,
+    곡목록: str = discord.Option(str, "노래 제목/URL 목록 (예: 곡1; 곡2; 곡3)")
+):
+    if not ctx.author.voice:
+        await ctx.respond(embed=embed_error("음성 채널에 먼저 참가해주세요"), ephemeral=True)
+        return
+    queries = [q.strip() for q in QUERY_SEPARATOR.split(곡목록) if q.strip()]
+    if not queries:
+        await ctx.respond(embed=embed_error("추가할 곡을 입력해주세요 (; 로 구분)"), ephemeral=True)
+        return
+    await ctx.defer()
+    try:
+        voice_client = await ensure_voice(ctx)
+        if voice_client is None:
+            return
+        player = ctx.bot.get_player(ctx.guild.id)
+        queue = player.queue
+        # 대기열에 들어갈 수 있는 만큼만 해석 (재생 중이 아니면 첫 곡은 바로 재생)
+        room = queue.room if player.is_active else queue.room + 1
+        overflow = queries[room:]
+        queries = queries[:room]
+        # 동시 해석 수를 제한해 다른 서버의 추출 요청을 밀어내지 않음
+        semaphore = asyncio.Semaphore(BULK_RESOLVE_CONCURRENCY)
+        async def resolve(query):
+            async with semaphore:
+                return await YTDLSource.create_source(query, loop=ctx.bot.loop)
+        results = await asyncio.gather(*(resolve(q) for q in queries), return_exceptions=True)
+        added = []
+        failed = []
+        for query, result in zip(queries, results):
+            if isinstance(result, Exception):
+                logger.debug(f"여러곡재생 해석 실패 ({query}): {result}")
+                failed.append((query, str(result)))
+            else:
+                added.append(result)
+        failed.extend((query, str(QueueFullError(queue.capacity))) for query in overflow)
+        # 원래 입력 순서대로 추가 (해석 중 다른 명령으로 채워진 만큼은 실패 처리)
+        room = queue.room if player.is_active else queue.room + 1
+        overflow = added[room:]
+        added = added[:room]
+        failed.extend((song.title, str(QueueFullError(queue.capacity))) for song in overflow)
+        embed = None
+        if added:
+            # 재생 중이 아니면 첫 곡부터 바로 재생 (첫 곡이 실패하면 플레이어가 건너뛰고 다음 곡 재생)
+            try:
+                _, accepted = await player.play(added, channel=ctx.channel)
+            except Exception as e:
+                # 예외가 나면 대기열에 들어간 곡이 없음 (연결 끊김, 대기열 가득 참, 재생할 곡이 첫 곡뿐인데 실패 등)
+                logger.debug(f"여러곡재생 재생 실패 ({len(added)}곡): {e}")
+                failed[:0] = [(song.title or song.url, str(e)) for song in added]
+            else:
+                # 해석하는 동안 대기열이 찼으면 들어가지 못한 뒤쪽 곡은 실패 처리
+                failed.extend((song.title or song.url, str(QueueFullError(queue.capacity))) for song in added[accepted:])
+                added = added[:accepted]
+                embed = embed_success("", title=f" {len(added)}곡 추가")
+                lines = [f"`{i}.` [{song.title}]({song.url})" for i, song in enumerate(added[:10], 1)]
+                if len(added) > 10:
+                    lines.append(f"*+{len(added) - 10}곡 더*")
+                embed.add_field(name="추가된 곡", value="\n".join(lines), inline=False)
+        if embed is None:
+            embed = embed_error("", title=" 추가된 곡이 없습니다")
+        if failed:
+            lines = [f"• {query[:40]} — {reason[:60]}" for query, reason in failed[:10]]
+            if len(failed) > 10:
+                lines.append(f"*+{len(failed) - 10}곡 더 실패*")
+            embed.add_field(name=f" 실패 ({len(failed)}곡)", value="\n".join(lines), inline=False)
+        embed.set_footer(text=f"요청자: {ctx.author.display_name}", icon_url=ctx.author.display_avatar.url)
+        await ctx.followup.send(embed=embed)
+    except Exception as e:
+        logger.error(f"여러곡재생 오류: {e}")
+        await ctx.followup.send(embed=embed_error(f"오류 발생: {str(e)}"))
+def setup(bot: discord.Bot) -> None:
+    """명령어 로드"""
+    bot.add_application_command(bulk_play)
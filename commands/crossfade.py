@@ -0,0 +1,24 @@
+import discord
+from utils import embed_error, embed_info
+@discord.slash_command(name="크로스페이드", description="곡 전환 시 앞뒤 곡을 겹쳐 재생하는 시간을 설정합니다")
+async def crossfade(
+    ctx: discord.ApplicationContext,
+    초: int = discord.Option(int, "겹칠 시간 (0-10초, 0이면 끄기)", min_value=0, max_value=10, required=False)
+):
+    if not hasattr(ctx.bot, 'data_manager'):
+        await ctx.respond(embed=embed_error("설정을 저장할 수 없습니다"), ephemeral=True)
+        return
+    guild_id = ctx.guild.id
+    if 초 is None:
+        current = ctx.bot.data_manager.get_guild_crossfade(guild_id)
+        text = f"**{current}초**" if current else "**꺼짐**"
+        await ctx.respond(embed=embed_info(f" 현재 크로스페이드: {text}"))
+        return
+    ctx.bot.data_manager.set_guild_crossfade(guild_id, 초)
+    if 초 == 0:
+        await ctx.respond(embed=embed_info(" 크로스페이드를 껐습니다"))
+    else:
+        await ctx.respond(embed=embed_info(f" 크로스페이드: **{초}초**\n\n*일반 출력 모드에서만 적용됩니다*"))
+def setup(bot: discord.Bot) -> None:
+    """명령어 로드"""
+    bot.add_application_command(crossfade)
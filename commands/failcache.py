@@ -0,0 +1,72 @@
+import logging
+import time
+from discord.ext import commands
+import discord
+from utils import embed_error, embed_info, embed_success
+from utils.negative_cache import negative_cache
+logger = logging.getLogger(__name__)
+_REASONS = {
+    "private": "비공개",
+    "unavailable": "사용 불가",
+    "not_available": "사용 불가",
+    "members_only": "멤버십 전용",
+    "blocked": "차단/지역 제한",
+}
+_MAX_LINES = 20
+@discord.slash_command(name="실패캐시", description="재생할 수 없는 곡 캐시를 확인하거나 비웁니다 (관리자 전용)")
+@commands.has_permissions(administrator=True)
+async def failcache(
+    ctx: discord.ApplicationContext,
+    동작: str = discord.Option(str, description="수행할 동작", choices=["목록", "삭제", "비우기"], default="목록"),
+    대상: str = discord.Option(str, description="삭제할 곡의 URL, 비디오 ID 또는 검색어", required=False, default=None),
+) -> None:
+    if 동작 == "비우기":
+        count = negative_cache.clear()
+        logger.info(f"재생 불가 곡 캐시 비움 ({count}개, 요청자: {ctx.author})")
+        await ctx.respond(embed=embed_success(f"재생 불가 곡 캐시 {count}개를 삭제했습니다"), ephemeral=True)
+        return
+    if 동작 == "삭제":
+        if not 대상:
+            await ctx.respond(embed=embed_error("삭제할 곡의 URL, 비디오 ID 또는 검색어를 입력해주세요"), ephemeral=True)
+            return
+        if negative_cache.remove(대상):
+            await ctx.respond(embed=embed_success(f"`{negative_cache.key_for(대상)}` 항목을 삭제했습니다"), ephemeral=True)
+        else:
+            await ctx.respond(embed=embed_error(f"`{negative_cache.key_for(대상)}` 항목이 캐시에 없습니다"), ephemeral=True)
+        return
+    entries = negative_cache.entries()
+    stats = negative_cache.stats()
+    if not entries:
+        await ctx.respond(embed=embed_info("캐시된 재생 불가 곡이 없습니다", title=" 재생 불가 곡 캐시"), ephemeral=True)
+        return
+    now = time.time()
+    lines = []
+    for entry in entries[:_MAX_LINES]:
+        remaining = max(0, int(negative_cache.ttl - (now - entry.stored_at)))
+        reason = _REASONS.get(entry.reason, entry.reason)
+        lines.append(f"`{entry.key[:40]}` · {reason} · 남은 시간 {remaining // 3600}시간 {remaining % 3600 // 60}분 · 차단 {entry.hits}회")
+    if len(entries) > _MAX_LINES:
+        lines.append(f"*+{len(entries) - _MAX_LINES}개 더*")
+    embed = embed_info("\n".join(lines), title=f" 재생 불가 곡 캐시 ({len(entries)}개)")
+    embed.set_footer(text=f"캐시로 건너뛴 추출 {stats['hits']:,}회")
+    await ctx.respond(embed=embed, ephemeral=True)
+@failcache.error
+async def failcache_error(ctx: discord.ApplicationContext, error: discord.DiscordException) -> None:
+    """에러 핸들러"""
+    if isinstance(error, commands.MissingPermissions):
+        await ctx.respond(
+            " 이 명령어는 관리자 권한이 필요합니다.",
+            ephemeral=True
+        )
+    else:
+        logger.error(f"Failcache command error: {error}")
+        try:
+            await ctx.respond(
+                f"오류가 발생했습니다: {error}",
+                ephemeral=True
+            )
+        except:
+            pass
+def setup(bot: discord.Bot) -> None:
+    """명령어 로드"""
+    bot.add_application_command(failcache)
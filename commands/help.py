@@ -7,8 +7,10 @@ async def help_command(ctx: discord.ApplicationContext) -> None:
         name=" 재생 명령어",
         value=(
             "`/재생 [노래제목/URL]` - 노래를 재생하거나 대기열에 추가\n"
+            "`/여러곡재생 [곡1; 곡2; ...]` - 여러 곡을 한 번에 추가\n"
             "`/일시정지` - 재생을 일시정지하거나 재개\n"
             "`/건너뛰기` - 현재 곡을 건너뜁니다\n"
+            "`/탐색 [mm:ss]` - 현재 곡의 원하는 위치로 이동\n"
             "`/중지` - 재생을 중지하고 음성 채널에서 나감"
         ),
         inline=False
@@ -28,6 +30,8 @@ async def help_command(ctx: discord.ApplicationContext) -> None:
         value=(
             "`/볼륨 [0-100]` - 볼륨 조절 (없으면 현재 볼륨 표시)\n"
             "`/반복 [모드]` - 반복 모드 설정 (끄기/현재곡/대기열)\n"
+            "`/출력모드 [모드]` - 출력 방식 설정 (일반/Opus 직결)\n"
+            "`/크로스페이드 [초]` - 곡 전환 시 겹쳐 재생할 시간 (0이면 끄기)\n"
             "`/현재재생` - 현재 재생 중인 노래 정보 확인"
         ),
         inline=False
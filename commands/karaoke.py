@@ -3,15 +3,28 @@ import numpy as np
 import os
 import speech_recognition as sr
 import tempfile
-import yt_dlp
+import threading
+import time
 import discord
 from difflib import SequenceMatcher
+from functools import partial
 from utils import embed_error, embed_info, embed_success, embed_neutral
+from utils.lyrics_renderer import lyrics_renderer
 from utils.lyrics_sync import fetch_lrc
+from utils.resolve_cache import resolution_cache
+from utils.sources import YTDLSource
+from utils.suggestions import autocomplete_title
+from utils.ytdl_pool import ytdl_pool
 try:
     import librosa
 except Exception:
     librosa = None
+# 풀링된 인스턴스는 호출마다 훅을 바꿀 수 없으므로 스레드별 콜백으로 전달
+_progress_local = threading.local()
+def _dispatch_progress(d: dict) -> None:
+    hook = getattr(_progress_local, 'hook', None)
+    if hook is not None:
+        hook(d)
 YTDL_STREAM_OPTIONS = {
     'format': 'bestaudio/best',
     'quiet': True,
@@ -25,9 +38,75 @@ YTDL_DOWNLOAD_OPTIONS = {
     'no_warnings': True,
     'default_search': 'auto',
     'noplaylist': True,
-    'outtmpl': os.path.join(tempfile.gettempdir(), 'karaoke-%(id)s.%(ext)s')
+    'outtmpl': os.path.join(tempfile.gettempdir(), 'karaoke-%(id)s.%(ext)s'),
+    'progress_hooks': [_dispatch_progress],
 }
 FFMPEG_OPTIONS = {'options': '-vn'}
+ytdl_pool.register("download", YTDL_DOWNLOAD_OPTIONS)
+def _download_audio(query: str, label: str, progress_hook=None) -> tuple[dict, str]:
+    """캐시된 info가 있으면 재추출 없이 다운로드, 없으면 추출 후 캐시에 저장 (다운로드 워커에서 실행)"""
+    _progress_local.hook = progress_hook
+    try:
+        with ytdl_pool.acquire("download") as ydl:
+            cached = resolution_cache.get_stream(query)
+            if cached is not None:
+                data = ydl.process_ie_result(dict(cached), download=True)
+            else:
+                data = ydl.extract_info(query, download=True)
+                if 'entries' in data:
+                    entries = [e for e in data.get('entries', []) if e]
+                    if not entries:
+                        raise ValueError(f"{label} 검색 결과가 없습니다")
+                    data = entries[0]
+                resolution_cache.put(data, query=query)
+            return data, ydl.prepare_filename(data)
+    finally:
+        _progress_local.hook = None
+class _DownloadProgress:
+    """다운로드 진행률을 모아 지연 응답 메시지를 주기적으로 수정"""
+    def __init__(self, ctx: discord.ApplicationContext, labels: list[str], interval: float = 1.5) -> None:
+        self.ctx = ctx
+        self.loop = asyncio.get_running_loop()
+        self.interval = interval
+        self.percent = {label: 0.0 for label in labels}
+        self._last_edit = 0.0
+        self._lock = threading.Lock()
+        self._pending = []
+        self.closed = False
+    def hook(self, label: str):
+        def _hook(d: dict) -> None:
+            # yt-dlp 워커 스레드에서 호출됨
+            status = d.get('status')
+            if status == 'downloading':
+                total = d.get('total_bytes') or d.get('total_bytes_estimate')
+                if total:
+                    self.percent[label] = min(100.0, d.get('downloaded_bytes', 0) * 100 / total)
+            elif status == 'finished':
+                self.percent[label] = 100.0
+            with self._lock:
+                now = time.monotonic()
+                if status != 'finished' and now - self._last_edit < self.interval:
+                    return
+                self._last_edit = now
+                self._pending.append(asyncio.run_coroutine_threadsafe(self.render(), self.loop))
+        return _hook
+    async def close(self) -> None:
+        """진행률 수정을 멈추고 이미 예약된 수정이 끝날 때까지 대기"""
+        self.closed = True
+        with self._lock:
+            pending, self._pending = self._pending, []
+        await asyncio.gather(*(asyncio.wrap_future(f) for f in pending), return_exceptions=True)
+    async def render(self) -> None:
+        if self.closed:
+            return
+        lines = []
+        for label, pct in self.percent.items():
+            filled = int(pct / 10)
+            lines.append(f"**{label}** {'▰' * filled}{'▱' * (10 - filled)} {pct:.0f}%")
+        try:
+            await self.ctx.edit(embed=embed_info("\n".join(lines), title=" 노래방 준비 중"))
+        except Exception:
+            pass
 class KaraokeSession:
     """클래스: KaraokeSession"""
     def __init__(self, title: str, user_id: int, original_audio_path: str, webpage_url: str | None, channel_id: int, message_id: int | None = None) -> None:
@@ -41,6 +120,8 @@ class KaraokeSession:
         self.webpage_url = webpage_url
         self.channel_id = channel_id
         self.message_id = message_id
+        self.started_at = None  # 반주 재생 시작 시각 (가사 싱크 기준, loop.time())
+        self.lyrics_task = None
 def calculate_similarity(original: str, recognized: str) -> float:
     original = original.lower().strip()
     recognized = recognized.lower().strip()
@@ -168,7 +249,7 @@ def get_grade(score: float) -> str:
 @discord.slash_command(name="노래방", description="씩씩이 노래방 모드")
 async def karaoke(
     ctx: discord.ApplicationContext,
-    제목_또는_url: str = discord.Option(str, description="노래의 제목이나 URL"),
+    제목_또는_url: str = discord.Option(str, description="노래의 제목이나 URL", autocomplete=autocomplete_title),
     mr검색: bool = discord.Option(bool, description="MR/반주 버전으로 검색 (체크 시: MR 재생, 미체크 시: 원곡 재생)", default=True)
 ):
     if not ctx.author.voice:
@@ -182,46 +263,43 @@ async def karaoke(
     # URL이 아닌 경우 검색어 준비
     is_url = 제목_또는_url.startswith("http")
     base_query = 제목_또는_url
-    # MR(반주) 버전 다운로드
+    # MR(반주) 버전 검색어
     if mr검색 and not is_url:
         mr_query = f"{base_query} mr" if "mr" not in base_query.lower() else base_query
     else:
         mr_query = base_query
-    try:
-        with yt_dlp.YoutubeDL(YTDL_DOWNLOAD_OPTIONS) as ydl:
-            data = ydl.extract_info(mr_query, download=True)
-            if 'entries' in data:
-                entries = [e for e in data.get('entries', []) if e]
-                if not entries:
-                    raise ValueError("MR(반주) 검색 결과가 없습니다")
-                data = entries[0]
-            mr_title = data.get('title')
-            mr_webpage_url = data.get('webpage_url') or data.get('url')
-            mr_audio_path = ydl.prepare_filename(data)
-    except Exception as e:
-        await ctx.followup.send(embed=embed_error(f"MR(반주) 다운로드 실패: {str(e)}"), ephemeral=True)
-        return
-    # 원곡(보컬 포함) 버전 다운로드 - MR과 다른 버전 찾기
+    # 원곡(보컬 포함) 버전 검색어 - MR과 다른 버전 찾기
     if not is_url:
         # MR 검색했으면 원곡은 기본 제목으로
         original_query = base_query if mr검색 else f"{base_query} 원곡"
     else:
         # URL인 경우 동일한 영상 사용
         original_query = base_query
-    try:
-        with yt_dlp.YoutubeDL(YTDL_DOWNLOAD_OPTIONS) as ydl:
-            data = ydl.extract_info(original_query, download=True)
-            if 'entries' in data:
-                entries = [e for e in data.get('entries', []) if e]
-                if not entries:
-                    raise ValueError("원곡(보컬 포함) 검색 결과가 없습니다")
-                data = entries[0]
-            original_title = data.get('title')
-            original_webpage_url = data.get('webpage_url') or data.get('url')
-            original_audio_path = ydl.prepare_filename(data)
-    except Exception as e:
-        await ctx.followup.send(embed=embed_error(f"원곡(보컬 포함) 다운로드 실패: {str(e)}"), ephemeral=True)
+    # MR/원곡 동시 다운로드 (같은 검색어면 한 번만)
+    progress = _DownloadProgress(ctx, ["MR(반주)", "원곡(보컬 포함)"])
+    await progress.render()
+    mr_job = YTDLSource.run_download(partial(_download_audio, label="MR(반주)", progress_hook=progress.hook("MR(반주)")), mr_query)
+    if original_query == mr_query:
+        progress.percent.pop("원곡(보컬 포함)")
+        results = await asyncio.gather(mr_job, return_exceptions=True)
+        results.append(results[0])
+    else:
+        original_job = YTDLSource.run_download(partial(_download_audio, label="원곡(보컬 포함)", progress_hook=progress.hook("원곡(보컬 포함)")), original_query)
+        results = await asyncio.gather(mr_job, original_job, return_exceptions=True)
+    mr_result, original_result = results
+    await progress.close()
+    if isinstance(mr_result, Exception):
+        await ctx.edit(embed=embed_error(f"MR(반주) 다운로드 실패: {str(mr_result)}"))
+        return
+    if isinstance(original_result, Exception):
+        await ctx.edit(embed=embed_error(f"원곡(보컬 포함) 다운로드 실패: {str(original_result)}"))
         return
+    data, mr_audio_path = mr_result
+    mr_title = data.get('title')
+    mr_webpage_url = data.get('webpage_url') or data.get('url')
+    data, original_audio_path = original_result
+    original_title = data.get('title')
+    original_webpage_url = data.get('webpage_url') or data.get('url')
     # 초기 임베드 전송 후 메시지 저장
     title_link = f"[{mr_title}]({mr_webpage_url})" if mr_webpage_url else f"**{mr_title}**"
     embed = embed_info(f" **재생**: {title_link}\n **채점 기준**: [{original_title}]({original_webpage_url})", title=" 노래방 모드 시작")
@@ -237,7 +315,8 @@ async def karaoke(
     )
     embed.add_field(name=" 재생 중", value=mr_title[:100], inline=False)
     embed.add_field(name=" 채점 기준", value=original_title[:100], inline=False)
-    first_message = await ctx.followup.send(embed=embed)
+    # 진행률을 표시하던 지연 응답을 시작 안내로 교체
+    first_message = await ctx.edit(embed=embed)
     # 세션에 MR/원곡 경로 모두 저장
     session = KaraokeSession(mr_title or mr_query, ctx.author.id, original_audio_path, mr_webpage_url, ctx.channel_id, first_message.id)
     session.mr_audio_path = mr_audio_path
@@ -260,22 +339,23 @@ async def karaoke(
                 fut.result()
             except Exception:
                 pass
+            # 노래방 중에 추가된 곡 재생
+            player = ctx.bot.players.get(ctx.guild.id)
+            if player is not None and player.queue:
+                asyncio.run_coroutine_threadsafe(player.play([]), ctx.bot.loop)
         initial_volume = ctx.bot.data_manager.get_guild_volume(guild_id) / 100 if hasattr(ctx.bot, 'data_manager') else 0.05
         source = discord.FFmpegPCMAudio(session.mr_audio_path, **FFMPEG_OPTIONS)
         source = discord.PCMVolumeTransformer(source, volume=initial_volume)
         voice_client.play(source, after=after_play)
+        loop = asyncio.get_event_loop()
+        session.started_at = loop.time()
         lyrics = await fetch_lrc(mr_title or mr_query)
         if lyrics:
             lyrics_msg = await ctx.followup.send(embed=embed_info("싱크 가사 준비 중..."))
-            async def send_lyrics() -> None:
-                start_time = asyncio.get_event_loop().time()
-                for t, line in lyrics:
-                    now = asyncio.get_event_loop().time()
-                    wait_sec = t - (now - start_time)
-                    if wait_sec > 0:
-                        await asyncio.sleep(wait_sec)
-                    await lyrics_msg.edit(embed=embed_info(line))
-            asyncio.create_task(send_lyrics())
+            # 노래방은 일시정지/탐색이 없으므로 반주 시작 후 경과 시간이 재생 위치
+            session.lyrics_task = asyncio.create_task(
+                lyrics_renderer.run(lyrics_msg, lyrics, lambda: loop.time() - session.started_at)
+            )
         else:
             await ctx.followup.send(embed=embed_info("싱크 가사를 찾을 수 없습니다."))
     except Exception as e:
@@ -288,6 +368,8 @@ async def finish_karaoke(guild_id: int, client: discord.Client) -> None:
     if session.completed:
         return
     session.completed = True
+    if session.lyrics_task and not session.lyrics_task.done():
+        session.lyrics_task.cancel()
     guild = client.get_guild(guild_id)
     if not guild:
         return
@@ -374,6 +456,8 @@ async def karaoke_stop(ctx: discord.ApplicationContext) -> None:
         await ctx.respond(embed=embed_error("노래방 세션을 시작한 사용자만 중지할 수 있습니다"), ephemeral=True)
         return
     await ctx.defer()
+    if session.lyrics_task and not session.lyrics_task.done():
+        session.lyrics_task.cancel()
     voice_client = ctx.guild.voice_client
     if not voice_client:
         del ctx.bot.karaoke_sessions[guild_id]
@@ -10,9 +10,6 @@ async def loop(
         required=True
     )
 ):
-    guild_id = ctx.guild.id
-    if not hasattr(ctx.bot, 'loop_mode'):
-        ctx.bot.loop_mode = {}
     mode_map = {
         "끄기": "off",
         "현재곡": "one",
@@ -29,7 +26,7 @@ async def loop(
         "all": "대기열 전체를 반복합니다"
     }
     selected_mode = mode_map[모드]
-    ctx.bot.loop_mode[guild_id] = selected_mode
+    ctx.bot.get_player(ctx.guild.id).loop_mode = selected_mode
     emoji = mode_emoji[selected_mode]
     text = mode_text[selected_mode]
     await ctx.respond(embed=embed_info(f"{emoji} {text}"))
@@ -1,6 +1,3 @@
-import asyncio
-import time
-import random
 import discord
 
 from utils import embed_neutral, embed_success, embed_info, embed_error
@@ -49,76 +46,64 @@ class NowPlayingControls(discord.ui.View):
         vc = await self._ensure_voice(interaction)
         if not vc:
             return
-        guild_id = interaction.guild.id
-        current_song = interaction.client.now_playing.get(guild_id) if hasattr(interaction.client, "now_playing") else None
-        vc.stop()
-        interaction.client.play_started_at.pop(guild_id, None)
-        interaction.client.play_offset.pop(guild_id, None)
-        interaction.client.play_paused_at.pop(guild_id, None)
+        await interaction.response.defer(ephemeral=True)
+        player = interaction.client.get_player(interaction.guild.id)
+        # 여러 명이 동시에 눌러도 이 곡은 한 번만 건너뜀
+        current_song = player.current
+        if not await player.skip(current_song):
+            await interaction.followup.send(embed=embed_info("⏩ 이미 다음 곡으로 넘어갔습니다"), ephemeral=True)
+            return
         msg = "⏩ 노래를 건너뛰었습니다"
         if current_song:
             msg = f"⏩ **{current_song.title}**을(를) 건너뛰었습니다"
-        await interaction.response.send_message(embed=embed_info(msg), ephemeral=True)
-        try:
-            from .play import play_next  # local import to avoid cycles
-
-            asyncio.run_coroutine_threadsafe(play_next(interaction), interaction.client.loop)
-        except Exception as e:  # pragma: no cover - defensive
-            import logging
-
-            logging.getLogger(__name__).error(f"skip button play_next 실패: {e}")
+        await interaction.followup.send(embed=embed_info(msg), ephemeral=True)
 
     @discord.ui.button(label="⏹️ 중지", style=discord.ButtonStyle.danger)
     async def stop_btn(self, button: discord.ui.Button, interaction: discord.Interaction) -> None:  # type: ignore[override]
         vc = await self._ensure_voice(interaction)
         if not vc:
             return
-        guild_id = interaction.guild.id
-        if vc.is_playing():
+        await interaction.response.defer(ephemeral=True)
+        player = interaction.client.players.pop(interaction.guild.id, None)
+        if player:
+            try:
+                await player.stop(disconnect=False)
+            except ValueError:
+                pass
+            await player.close()
+        elif vc.is_playing():
             vc.stop()
-        interaction.client.music_queues.pop(guild_id, None)
-        interaction.client.now_playing.pop(guild_id, None)
-        interaction.client.play_started_at.pop(guild_id, None)
-        interaction.client.play_offset.pop(guild_id, None)
-        interaction.client.play_paused_at.pop(guild_id, None)
         try:
             await vc.disconnect(force=False)
         except Exception:
             pass
-        await interaction.response.send_message(embed=embed_neutral("⏹️ 재생을 중지하고 나갔습니다"), ephemeral=True)
+        await interaction.followup.send(embed=embed_neutral("⏹️ 재생을 중지하고 나갔습니다"), ephemeral=True)
 
     @discord.ui.button(label="🔀 섞기", style=discord.ButtonStyle.secondary)
     async def shuffle_btn(self, button: discord.ui.Button, interaction: discord.Interaction) -> None:  # type: ignore[override]
         vc = await self._ensure_voice(interaction)
         if not vc:
             return
-        guild_id = interaction.guild.id
-        queue = interaction.client.music_queues.get(guild_id, []) if hasattr(interaction.client, "music_queues") else []
-        if len(queue) < 2:
+        player = interaction.client.players.get(interaction.guild.id)
+        if not player or len(player.queue) < 2:
             await interaction.response.send_message(embed=embed_error(" 섞을 노래가 충분하지 않습니다"), ephemeral=True)
             return
-        random.shuffle(queue)
-        await interaction.response.send_message(embed=embed_success(f"🔀 대기열 **{len(queue)}곡**을 섞었습니다"), ephemeral=True)
+        player.shuffle()
+        await interaction.response.send_message(embed=embed_success(f"🔀 대기열 **{len(player.queue)}곡**을 섞었습니다"), ephemeral=True)
 
 
 @discord.slash_command(name="현재재생", description="현재 재생 중인 노래 정보를 확인합니다")
 async def nowplaying(ctx: discord.ApplicationContext) -> None:
-    guild_id = ctx.guild.id
-    if guild_id not in ctx.bot.now_playing:
+    player = ctx.bot.players.get(ctx.guild.id)
+    if not player or player.current is None:
         await ctx.respond(embed=embed_neutral(" 재생 중인 노래가 없습니다"), ephemeral=True)
         return
 
-    now = ctx.bot.now_playing[guild_id]
+    now = player.current
     duration = getattr(now, "duration", None)
 
-    # 경과 시간 계산
-    start = ctx.bot.play_started_at.get(guild_id)
-    paused_at = ctx.bot.play_paused_at.get(guild_id)
-    paused_offset = ctx.bot.play_offset.get(guild_id, 0.0)
-    elapsed = 0.0
-    if start:
-        base_now = paused_at or time.time()
-        elapsed = max(0.0, (base_now - start) - paused_offset)
+    # 경과 시간 (일시정지 구간 제외)
+    elapsed = player.elapsed()
 
     embed = embed_success("", title=" 현재 재생 중")
     embed.add_field(name="제목", value=f"[{now.title}]({now.webpage_url})", inline=False)
@@ -133,13 +118,11 @@ async def nowplaying(ctx: discord.ApplicationContext) -> None:
         embed.add_field(name=" 볼륨", value=f"{volume}%", inline=True)
 
     # 반복 모드
-    loop_mode = ctx.bot.loop_mode.get(guild_id, "off") if hasattr(ctx.bot, "loop_mode") else "off"
-    loop_label = {"off": "꺼짐", "one": "현재곡", "all": "대기열"}.get(loop_mode, "꺼짐")
+    loop_label = {"off": "꺼짐", "one": "현재곡", "all": "대기열"}.get(player.loop_mode, "꺼짐")
     embed.add_field(name=" 반복", value=loop_label, inline=True)
 
     # 대기열 길이
-    queue_len = len(ctx.bot.music_queues.get(guild_id, [])) if hasattr(ctx.bot, "music_queues") else 0
-    embed.add_field(name=" 대기열", value=f"{queue_len}곡", inline=True)
+    embed.add_field(name=" 대기열", value=f"{len(player.queue)}곡", inline=True)
 
     # 업로더
     if hasattr(now, "uploader") and now.uploader:
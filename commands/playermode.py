@@ -0,0 +1,34 @@
+import discord
+from utils import embed_error, embed_info
+@discord.slash_command(name="출력모드", description="음성 출력 방식을 설정합니다 (다음 곡부터 적용)")
+async def playermode(
+    ctx: discord.ApplicationContext,
+    모드: str = discord.Option(
+        str,
+        "출력 모드",
+        choices=["일반", "Opus 직결"],
+        required=False
+    )
+):
+    if not hasattr(ctx.bot, 'data_manager'):
+        await ctx.respond(embed=embed_error("설정을 저장할 수 없습니다"), ephemeral=True)
+        return
+    mode_map = {
+        "일반": "pcm",
+        "Opus 직결": "opus"
+    }
+    mode_text = {
+        "pcm": "일반 (PCM 변환 후 봇에서 볼륨 처리)",
+        "opus": "Opus 직결 (FFmpeg에서 볼륨 처리, CPU 사용량 감소)"
+    }
+    guild_id = ctx.guild.id
+    if 모드 is None:
+        current = ctx.bot.data_manager.get_guild_player_mode(guild_id)
+        await ctx.respond(embed=embed_info(f" 현재 출력 모드: **{mode_text.get(current, current)}**"))
+        return
+    selected_mode = mode_map[모드]
+    ctx.bot.data_manager.set_guild_player_mode(guild_id, selected_mode)
+    await ctx.respond(embed=embed_info(f" 출력 모드 설정: **{mode_text[selected_mode]}**\n\n*다음 곡부터 적용됩니다*"))
+def setup(bot: discord.Bot) -> None:
+    """명령어 로드"""
+    bot.add_application_command(playermode)
@@ -2,7 +2,7 @@ import asyncio
 import discord
 
 from utils import embed_error, embed_success, embed_info
-from .play import YTDLSource, play_next
+from utils.track import track_catalog
 
 
 @discord.slash_command(name="대기열저장", description="현재 대기열을 이름으로 저장합니다")
@@ -11,11 +11,12 @@ async def save_queue(
     이름: str = discord.Option(str, description="저장할 이름"),
 ) -> None:
     guild_id = ctx.guild.id
-    queue = ctx.bot.music_queues.get(guild_id, []) if hasattr(ctx.bot, "music_queues") else []
+    player = ctx.bot.players.get(guild_id)
+    queue = player.queue if player else []
     if not queue:
         await ctx.respond(embed=embed_error(" 저장할 대기열이 없습니다"), ephemeral=True)
         return
-    ctx.bot.save_playlist_named(guild_id, 이름, queue)
+    ctx.bot.save_playlist_named(guild_id, 이름, [track.to_dict() for track in queue])
     await ctx.respond(embed=embed_success(f"'{이름}' 이름으로 대기열 {len(queue)}곡을 저장했습니다"))
 
 
@@ -52,40 +53,33 @@ async def load_queue(
             return
 
     # 대기열 교체
-    ctx.bot.music_queues[guild_id] = list(playlist)
+    await ctx.defer()
+    player = ctx.bot.get_player(guild_id)
+    try:
+        player.replace_queue(track_catalog.from_info(item) for item in playlist)
+    except ValueError as e:
+        await ctx.respond(embed=embed_error(str(e)), ephemeral=True)
+        return
 
-    if voice_client.is_playing():
+    if player.is_active:
         await ctx.respond(embed=embed_success(f"'{이름}'을(를) 불러왔습니다. 현재 곡 이후 {len(playlist)}곡 대기"))
         return
 
-    # 즉시 재생 시작
+    # 즉시 재생 시작 (대기열 첫 곡부터)
     try:
-        first = ctx.bot.music_queues[guild_id].pop(0)
-        volume = ctx.bot.data_manager.get_guild_volume(guild_id) / 100 if hasattr(ctx.bot, "data_manager") else 0.05
-        player = await YTDLSource.prepare_player(first, loop=ctx.bot.loop, volume=volume)
+        started, _ = await player.play([], channel=ctx.channel)
     except Exception as e:
         await ctx.respond(embed=embed_error(f"재생 준비 실패: {str(e)}"), ephemeral=True)
         return
-
-    def after_play(err):
-        if err:
-            import logging
-
-            logging.getLogger(__name__).error(f"대기열불러오기 재생 오류: {err}")
-        try:
-            asyncio.run_coroutine_threadsafe(play_next(ctx), ctx.bot.loop)
-        except Exception:
-            pass
-
-    voice_client.play(player, after=after_play)
-    ctx.bot.now_playing[guild_id] = player
-    now = asyncio.get_event_loop().time()
-    ctx.bot.play_started_at[guild_id] = now
-    ctx.bot.play_offset[guild_id] = 0.0
-    ctx.bot.play_paused_at.pop(guild_id, None)
+    if not started and player.retry_pending:
+        await ctx.respond(embed=embed_error("첫 곡을 재생하지 못했습니다. 잠시 후 다음 곡으로 다시 시도합니다"))
+        return
+    if not started:
+        await ctx.respond(embed=embed_error("재생할 수 있는 곡이 없습니다"), ephemeral=True)
+        return
 
     embed = embed_success("", title=" 재생 중")
-    embed.add_field(name="제목", value=f"[{first['title']}]({first['webpage_url']})", inline=False)
+    embed.add_field(name="제목", value=f"[{player.current.title}]({player.current.webpage_url})", inline=False)
     await ctx.respond(embed=embed)
 
 
@@ -1,23 +1,15 @@
 import asyncio
 import logging
-import yt_dlp
 import discord
 
 from utils import embed_error, embed_info, embed_success
-from .play import YTDLSource, play_next
+from utils.constants import SEARCH_PAGE_SIZE
+from utils.search_cache import search_cache
+from utils.sources import YTDLSource
+from utils.suggestions import autocomplete_url
 
 logger = logging.getLogger(__name__)
 
-SEARCH_OPTIONS = {
-    "format": "bestaudio/best",
-    "quiet": True,
-    "no_warnings": True,
-    "default_search": "ytsearch5",
-    "noplaylist": True,
-    "skip_download": True,
-    "source_address": "0.0.0.0",
-}
-
 
 def _fmt_duration(seconds: int | None) -> str:
     if seconds is None:
@@ -26,14 +18,29 @@ def _fmt_duration(seconds: int | None) -> str:
     return f"{m}:{s:02d}"
 
 
+def _results_embed(results, page: int) -> discord.Embed:
+    offset = page * SEARCH_PAGE_SIZE
+    desc_lines = []
+    for idx, item in enumerate(results, offset + 1):
+        dur = _fmt_duration(item.duration)
+        desc_lines.append(f"`{idx}.` [{item.title or item.url}]({item.url}) • {dur}")
+    title = " 검색 결과" if page == 0 else f" 검색 결과 ({page + 1}페이지)"
+    return embed_info("\n".join(desc_lines), title=title)
+
+
 class SearchSelectView(discord.ui.View):
-    def __init__(self, results, author_id: int, *, timeout: float = 90.0) -> None:
+    def __init__(self, results, author_id: int, *, query: str | None = None, page: int = 0, has_more: bool = False, timeout: float = 90.0) -> None:
         super().__init__(timeout=timeout)
         self.results = results
         self.author_id = author_id
-        for idx, item in enumerate(results[:5], 1):
-            label = f"{idx}. {item['title'][:60]}"
-            self.add_item(SearchButton(label=label, idx=idx - 1))
+        self.query = query
+        self.page = page
+        offset = page * SEARCH_PAGE_SIZE
+        for idx, item in enumerate(results[:SEARCH_PAGE_SIZE]):
+            label = f"{offset + idx + 1}. {(item.title or item.url)[:60]}"
+            self.add_item(SearchButton(label=label, idx=idx))
+        if query and has_more:
+            self.add_item(MoreResultsButton())
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:  # type: ignore[override]
         if interaction.user.id != self.author_id:
@@ -42,6 +49,31 @@ class SearchSelectView(discord.ui.View):
         return True
 
 
+class MoreResultsButton(discord.ui.Button):
+    def __init__(self) -> None:
+        super().__init__(style=discord.ButtonStyle.secondary, label="더 보기", row=1)
+
+    async def callback(self, interaction: discord.Interaction) -> None:  # type: ignore[override]
+        view: SearchSelectView = self.view  # type: ignore
+        await interaction.response.defer()
+        page = view.page + 1
+        try:
+            # 다음 페이지는 눌렀을 때 조회 (캐시에 있으면 바로)
+            results, has_more = await search_cache.page(view.query, page)
+        except Exception as e:
+            logger.error(f"다음 검색 결과 조회 실패: {e}")
+            await interaction.followup.send(embed=embed_error(f"검색 중 오류 발생: {str(e)}"), ephemeral=True)
+            return
+        if not results:
+            self.disabled = True
+            await interaction.edit_original_response(view=view)
+            await interaction.followup.send(embed=embed_error("더 이상 검색 결과가 없습니다"), ephemeral=True)
+            return
+        view.stop()
+        new_view = SearchSelectView(results, view.author_id, query=view.query, page=page, has_more=has_more)
+        await interaction.edit_original_response(embed=_results_embed(results, page), view=new_view)
+
+
 class SearchButton(discord.ui.Button):
     def __init__(self, *, label: str, idx: int) -> None:
         super().__init__(style=discord.ButtonStyle.primary, label=label)
@@ -77,59 +109,26 @@ class SearchButton(discord.ui.Button):
                 await interaction.response.send_message(embed=embed_error(f"채널 이동 실패: {str(e)}"), ephemeral=True)
                 return
 
-        guild_id = guild.id
-        if guild_id not in interaction.client.music_queues:
-            interaction.client.music_queues[guild_id] = []
-
-        queue = interaction.client.music_queues[guild_id]
-        is_playing = voice_client.is_connected() and voice_client.is_playing()
-
-        # append or play
-        if is_playing:
-            queue.append(selection)
-            embed = embed_success("", title=" 재생목록에 추가")
-            embed.add_field(name="제목", value=f"[{selection['title']}]({selection['webpage_url']})", inline=False)
-            if selection.get("duration"):
-                embed.add_field(name=" 재생시간", value=_fmt_duration(selection["duration"]), inline=True)
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-        else:
-            try:
-                volume = interaction.client.data_manager.get_guild_volume(guild_id) / 100 if hasattr(interaction.client, "data_manager") else 0.05
-                player = await YTDLSource.prepare_player(selection, loop=interaction.client.loop, volume=volume)
-            except Exception as e:
-                await interaction.response.send_message(embed=embed_error(f"재생 준비 실패: {str(e)}"), ephemeral=True)
-                return
-
-            def after_play(err):
-                if err:
-                    logger.error(f"검색 선택 재생 오류: {err}")
-                try:
-                    asyncio.run_coroutine_threadsafe(play_next(interaction), interaction.client.loop)
-                except Exception as e:  # pragma: no cover
-                    logger.error(f"검색 선택 다음 곡 예약 실패: {e}")
-
-            try:
-                voice_client.play(player, after=after_play)
-                interaction.client.now_playing[guild_id] = player
-                now = asyncio.get_event_loop().time()
-                interaction.client.play_started_at[guild_id] = now
-                interaction.client.play_offset[guild_id] = 0.0
-                interaction.client.play_paused_at.pop(guild_id, None)
-            except Exception as e:
-                await interaction.response.send_message(embed=embed_error(f"재생 실패: {str(e)}"), ephemeral=True)
-                return
+        # 곡 준비에 시간이 걸릴 수 있으므로 먼저 응답을 지연
+        await interaction.response.defer(ephemeral=True)
+        player = interaction.client.get_player(guild.id)
+        try:
+            started, _ = await player.play([selection], channel=interaction.channel)
+        except Exception as e:
+            await interaction.followup.send(embed=embed_error(f"재생 실패: {str(e)}"), ephemeral=True)
+            return
 
-            embed = embed_success("", title=" 재생 중")
-            embed.add_field(name="제목", value=f"[{selection['title']}]({selection['webpage_url']})", inline=False)
-            if selection.get("duration"):
-                embed.add_field(name=" 재생시간", value=_fmt_duration(selection["duration"]), inline=True)
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+        embed = embed_success("", title=" 재생 중" if started else " 재생목록에 추가")
+        embed.add_field(name="제목", value=f"[{selection.title or selection.url}]({selection.url})", inline=False)
+        if selection.duration:
+            embed.add_field(name=" 재생시간", value=_fmt_duration(selection.duration), inline=True)
+        await interaction.followup.send(embed=embed, ephemeral=True)
 
 
 @discord.slash_command(name="검색", description="노래를 검색하고 선택하여 재생/추가합니다")
 async def search(
     ctx: discord.ApplicationContext,
-    제목_또는_url: str = discord.Option(str, description="검색할 노래 제목 또는 URL"),
+    제목_또는_url: str = discord.Option(str, description="검색할 노래 제목 또는 URL", autocomplete=autocomplete_url),
 ):
     if not ctx.author.voice:
         await ctx.respond(embed=embed_error("먼저 음성 채널에 참가해주세요"), ephemeral=True)
@@ -138,37 +137,21 @@ async def search(
     await ctx.defer()
     query = 제목_또는_url
     try:
-        with yt_dlp.YoutubeDL(SEARCH_OPTIONS) as ydl:
-            data = ydl.extract_info(query, download=False)
-            entries = data.get("entries", []) if data else []
-            results = []
-            for item in entries[:5]:
-                if not item:
-                    continue
-                results.append(
-                    {
-                        "webpage_url": item.get("webpage_url") or item.get("url"),
-                        "title": item.get("title"),
-                        "duration": item.get("duration"),
-                        "thumbnail": item.get("thumbnail"),
-                        "uploader": item.get("uploader"),
-                        "view_count": item.get("view_count"),
-                    }
-                )
-            if not results:
-                await ctx.followup.send(embed=embed_error("검색 결과가 없습니다"), ephemeral=True)
-                return
+        # 지연 응답을 진행 상태로 수정한 뒤 검색 (목록은 평면 추출, 선택한 곡만 재생 시 해석)
+        await ctx.edit(embed=embed_info(f"🔎 **{query[:80]}** 검색 중..."))
+        if query.startswith("http"):
+            results, has_more = [await YTDLSource.create_source(query, loop=ctx.bot.loop)], False
+        else:
+            results, has_more = await search_cache.page(query)
+        if not results:
+            await ctx.edit(embed=embed_error("검색 결과가 없습니다"))
+            return
 
-            desc_lines = []
-            for idx, item in enumerate(results, 1):
-                dur = _fmt_duration(item.get("duration"))
-                desc_lines.append(f"`{idx}.` [{item['title']}]({item['webpage_url']}) • {dur}")
-            embed = embed_info("\n".join(desc_lines), title=" 검색 결과 (최대 5개)")
-            view = SearchSelectView(results, ctx.author.id)
-            await ctx.followup.send(embed=embed, view=view)
+        view = SearchSelectView(results, ctx.author.id, query=query, page=0, has_more=has_more)
+        await ctx.edit(embed=_results_embed(results, 0), view=view)
     except Exception as e:
         logger.error(f"검색 실패: {e}")
-        await ctx.followup.send(embed=embed_error(f"검색 중 오류 발생: {str(e)}"), ephemeral=True)
+        await ctx.edit(embed=embed_error(f"검색 중 오류 발생: {str(e)}"))
 
 
 def setup(bot: discord.Bot) -> None:
@@ -0,0 +1,34 @@
+import discord
+from utils import embed_error, embed_info
+from utils.sources import parse_timestamp
+def _format_time(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+@discord.slash_command(name="탐색", description="현재 곡의 원하는 위치로 이동합니다")
+async def seek(
+    ctx: discord.ApplicationContext,
+    위치: str = discord.Option(str, description="이동할 위치 (예: 1:30, 90, 1m30s)")
+) -> None:
+    voice_client = ctx.guild.voice_client
+    player = ctx.bot.players.get(ctx.guild.id)
+    if not voice_client or not player or not player.is_active or player.current is None:
+        await ctx.respond(embed=embed_error(" 재생 중인 노래가 없습니다"), ephemeral=True)
+        return
+    position = parse_timestamp(위치)
+    if position is None:
+        await ctx.respond(embed=embed_error("시간 형식이 올바르지 않습니다 (예: 1:30, 90, 1m30s)"), ephemeral=True)
+        return
+    await ctx.defer()
+    try:
+        moved = await player.seek(position)
+    except ValueError as e:
+        await ctx.followup.send(embed=embed_error(str(e)))
+        return
+    if not moved:
+        await ctx.followup.send(embed=embed_error("현재 재생 소스는 탐색을 지원하지 않습니다"))
+        return
+    await ctx.followup.send(embed=embed_info(f"⏩ **{player.current.title}** {_format_time(position)}(으)로 이동했습니다"))
+def setup(bot: discord.Bot) -> None:
+    """명령어 로드"""
+    bot.add_application_command(seek)
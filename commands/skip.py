@@ -12,21 +12,18 @@ async def skip(ctx: discord.ApplicationContext) -> None:
     if not voice_client.is_playing():
         await ctx.respond(embed=embed_error(" 재생 중인 노래가 없습니다"), ephemeral=True)
         return
-    guild_id = ctx.guild.id
-    queue_count = len(ctx.bot.music_queues.get(guild_id, []))
-    # 현재 재생 중인 곡 정보
-    current_song = None
-    if guild_id in ctx.bot.now_playing:
-        current_song = ctx.bot.now_playing[guild_id]
-    voice_client.stop()
-    # 타이밍 메타데이터 정리
-    ctx.bot.play_started_at.pop(guild_id, None)
-    ctx.bot.play_offset.pop(guild_id, None)
-    ctx.bot.play_paused_at.pop(guild_id, None)
+    await ctx.defer()
+    player = ctx.bot.get_player(ctx.guild.id)
+    # 현재 재생 중인 곡 정보 (동시에 눌린 건너뛰기는 한 번만 처리)
+    current_song = player.current
+    if not await player.skip(current_song):
+        await ctx.respond(embed=embed_info("⏩ 이미 다음 곡으로 넘어갔습니다"))
+        return
+    queue_count = len(player.queue)
     msg = "⏩ 노래를 건너뛰었습니다"
     if current_song:
         msg = f"⏩ **{current_song.title}**을(를) 건너뛰었습니다"
-    if queue_count > 0:
+    if queue_count > 0 or player.loop_mode == "one":
         msg += f"\n\n🔜 다음 곡 재생 중... ({queue_count}곡 대기)"
     else:
         msg += "\n\n 대기열이 비어있습니다. 음성 채널에서 나갑니다."
@@ -1,4 +1,9 @@
 import discord
+from utils.circuit_breaker import extraction_breaker, lyrics_breaker
+from utils.extraction_executor import extraction_executor
+from utils.lyrics_cache import lyrics_cache
+from utils.lyrics_renderer import lyrics_renderer
+_BREAKER_STATES = {"closed": "정상", "open": "중단", "half_open": "재시도 중"}
 @discord.slash_command(name="통계", description="봇의 사용 통계를 확인합니다")
 async def stats(ctx: discord.ApplicationContext) -> None:
     await ctx.defer()
@@ -29,6 +34,33 @@ async def stats(ctx: discord.ApplicationContext) -> None:
     embed.add_field(name="💤 대기 중", value=f"```{idle_count}개 서버```", inline=True)
     avg_members = total_members // total_servers if total_servers > 0 else 0
     embed.add_field(name="📈 평균 멤버", value=f"```{avg_members:,}명```", inline=True)
+    ex = extraction_executor.stats()
+    breaker = extraction_breaker.stats()
+    embed.add_field(
+        name="⛏️ 추출 대기열",
+        value=(
+            f"```우선 {ex['interactive_depth']}건 (평균 대기 {ex['interactive_avg_wait']:.2f}s)\n"
+            f"백그라운드 {ex['background_depth']}건 (평균 대기 {ex['background_avg_wait']:.2f}s)\n"
+            f"워커 {ex['workers']}개 · 완료 {ex['completed']:,}건\n"
+            f"차단기 {_BREAKER_STATES[breaker['state']]} (최근 실패 {breaker['recent_failures']}건, 누적 {breaker['trips']}회)```"
+        ),
+        inline=False
+    )
+    lc = lyrics_cache.stats()
+    lb = lyrics_breaker.stats()
+    lr = lyrics_renderer.stats()
+    lookups = lc["memory_hits"] + lc["disk_hits"] + lc["misses"]
+    hit_rate = (lc["memory_hits"] + lc["disk_hits"]) / lookups * 100 if lookups else 0.0
+    embed.add_field(
+        name="🎤 가사 캐시",
+        value=(
+            f"```메모리 {lc['memory_hits']:,}건 · 디스크 {lc['disk_hits']:,}건 · 미스 {lc['misses']:,}건\n"
+            f"적중률 {hit_rate:.1f}%\n"
+            f"lrclib 차단기 {_BREAKER_STATES[lb['state']]} (누적 {lb['trips']}회)\n"
+            f"표시 중 {lr['sessions']}곡 · 수정 {lr['edits']:,}회 · 건너뛴 줄 {lr['dropped']:,}줄```"
+        ),
+        inline=False
+    )
     embed.set_footer(text=f"요청자: {ctx.author.name}",
         icon_url=ctx.author.display_avatar.url
     )
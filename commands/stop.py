@@ -6,37 +6,22 @@ async def stop(ctx: discord.ApplicationContext) -> None:
     if not voice_client:
         await ctx.respond(embed=embed_error(" 음성 채널에 연결되어 있지 않습니다"), ephemeral=True)
         return
+    player = ctx.bot.players.pop(ctx.guild.id, None)
     # 연결이 이미 끊어진 경우 정리만 수행
     if not voice_client.is_connected():
-        guild_id = ctx.guild.id
-        ctx.bot.music_queues.pop(guild_id, None)
-        ctx.bot.now_playing.pop(guild_id, None)
-        if guild_id in ctx.bot.lyrics_tasks:
-            task = ctx.bot.lyrics_tasks.pop(guild_id)
-            if not task.done():
-                task.cancel()
+        if player:
+            await player.close()
         await ctx.respond(embed=embed_neutral("⏹️ 연결이 이미 종료되었습니다"))
         return
-    guild_id = ctx.guild.id
-    queue_count = len(ctx.bot.music_queues.get(guild_id, []))
-    # 재생 중지
-    if voice_client.is_playing():
-        voice_client.stop()
-    ctx.bot.play_started_at.pop(guild_id, None)
-    ctx.bot.play_offset.pop(guild_id, None)
-    ctx.bot.play_paused_at.pop(guild_id, None)
-    # 가사 Task 정리
-    if guild_id in ctx.bot.lyrics_tasks:
-        task = ctx.bot.lyrics_tasks.pop(guild_id)
-        if not task.done():
-            task.cancel()
-            try:
-                await task
-            except Exception:
-                pass
-    # 데이터 정리
-    ctx.bot.music_queues.pop(guild_id, None)
-    ctx.bot.now_playing.pop(guild_id, None)
+    await ctx.defer()
+    queue_count = 0
+    if player:
+        # 처리 중인 요청이 끝난 뒤 재생 중지 + 대기열 정리
+        try:
+            queue_count = await player.stop(disconnect=False)
+        except ValueError:
+            pass
+        await player.close()
     try:
         await voice_client.disconnect(force=False)
     except Exception:
@@ -1,5 +1,6 @@
 import discord
 from utils import embed_error, embed_info
+from utils.sources import YTDLOpusSource
 @discord.slash_command(name="볼륨", description="볼륨을 조절합니다")
 async def volume(
     ctx: discord.ApplicationContext,
@@ -41,13 +42,25 @@ async def volume(
         await ctx.respond(embed=embed_error("현재 재생 소스는 실시간 볼륨 조절을 지원하지 않습니다."), ephemeral=True)
         return
     old_volume = int(source.volume * 100)
-    source.volume = level / 100
+    if isinstance(source, YTDLOpusSource):
+        # Opus 직결 모드는 FFmpeg 필터로 볼륨을 적용하므로 현재 위치에서 재시작
+        await ctx.defer()
+        try:
+            await ctx.bot.get_player(ctx.guild.id).restart_opus(volume=level / 100)
+        except Exception as e:
+            await ctx.followup.send(embed=embed_error(f"볼륨 적용 실패: {str(e)}"))
+            return
+    else:
+        source.volume = level / 100
     # 볼륨 저장
     if hasattr(ctx.bot, 'data_manager'):
         ctx.bot.data_manager.set_guild_volume(ctx.guild.id, level)
     emoji = "🔇" if level == 0 else "🔉" if level < 30 else "" if level < 70 else "📢"
     embed = embed_info(f"{emoji} 볼륨: **{old_volume}%** → **{level}%**")
-    await ctx.respond(embed=embed)
+    if ctx.response.is_done():
+        await ctx.followup.send(embed=embed)
+    else:
+        await ctx.respond(embed=embed)
 def setup(bot: discord.Bot) -> None:
     """명령어 로드"""
     bot.add_application_command(volume)
@@ -7,13 +7,19 @@ import sys
 import discord
 from dotenv import load_dotenv
 
+# utils.constants가 환경 변수를 읽으므로 utils보다 먼저 로드
+load_dotenv()
+
 from utils.extension_loader import ExtensionLoader
 from utils.data_manager import DataManager
 from utils.constants import AUTO_SAVE_INTERVAL, DEFAULT_ACTIVITY_NAME
+from utils.extraction_executor import download_executor, extraction_executor
+from utils.guild_player import GuildPlayer
+from utils.http_client import http_client
+from utils.ytdl_pool import ytdl_pool
 from utils.graceful_shutdown import setup_graceful_shutdown, register_shutdown_callback
 from utils.logging_config import configure_logging
 
-load_dotenv()
 configure_logging()
 
 import logging
@@ -33,18 +39,21 @@ class MusicBot(discord.Bot):
 
         self.data_manager = DataManager(self)
         self.extension_loader = ExtensionLoader(self)
-        self.music_queues = {}
-        self.now_playing = {}
-        self.play_started_at = {}
-        self.play_offset = {}
-        self.play_paused_at = {}
+        self.players: dict[int, GuildPlayer] = {}
+        # 가사 등 외부 API 요청용 (discord.Bot.http와 구분)
+        self.http_client = http_client
         self.karaoke_sessions = {}
-        self.lyrics_tasks = {}
-        self.loop_mode = {}
         self._initialized = False
         self._auto_save_task: asyncio.Task | None = None
         self._status_update_task: asyncio.Task | None = None
 
+    def get_player(self, guild_id: int) -> GuildPlayer:
+        """서버 플레이어 (없으면 생성)"""
+        player = self.players.get(guild_id)
+        if player is None:
+            player = self.players[guild_id] = GuildPlayer(self, guild_id)
+        return player
+
     async def on_ready(self) -> None:
         """봇 준비 완료"""
         if self._initialized or not self.user:
@@ -61,6 +70,7 @@ class MusicBot(discord.Bot):
     async def _initialize(self) -> None:
         """초기화 로직"""
         self.data_manager.load_data()
+        await self.http_client.open()
         
         self.extension_loader.load_all_extensions("commands")
         if self.extension_loader.failed_extensions:
@@ -138,19 +148,10 @@ class MusicBot(discord.Bot):
         if before.channel and not after.channel:
             guild_id = before.channel.guild.id
             
-            if guild_id in self.lyrics_tasks:
-                task = self.lyrics_tasks.pop(guild_id)
-                if not task.done():
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
-            
-            self.music_queues.pop(guild_id, None)
-            self.now_playing.pop(guild_id, None)
+            player = self.players.pop(guild_id, None)
+            if player:
+                await player.close()
             self.karaoke_sessions.pop(guild_id, None)
-            self.loop_mode.pop(guild_id, None)
             
             try:
                 await self._update_status()
@@ -206,14 +207,13 @@ class MusicBot(discord.Bot):
             except asyncio.CancelledError:
                 pass
         
-        for guild_id, task in list(self.lyrics_tasks.items()):
-            if not task.done():
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-        self.lyrics_tasks.clear()
+        for player in list(self.players.values()):
+            await player.close()
+        self.players.clear()
+        extraction_executor.shutdown()
+        download_executor.shutdown()
+        ytdl_pool.close()
+        await self.http_client.close()
         
         if self.data_manager:
             self.data_manager.save_data()
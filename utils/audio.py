@@ -0,0 +1,132 @@
+"""NumPy 기반 PCM 오디오 처리 (볼륨, 소프트 클리핑, 크로스페이드)"""
+from __future__ import annotations
+from typing import Optional
+
+import discord
+import numpy as np
+
+__all__ = [
+    "FRAME_SAMPLES",
+    "FRAME_SECONDS",
+    "NumpyVolumeTransformer",
+    "CrossfadeSource",
+]
+
+# 48kHz 스테레오 16bit, 20ms 프레임 = 960 * 2 샘플
+FRAME_SAMPLES = 960 * 2
+FRAME_SECONDS = 0.02
+_INT16_MAX = 32767.0
+
+
+class _FrameBuffers:
+    """프레임 처리용으로 미리 할당한 버퍼 (재생 중 추가 할당 없음)"""
+
+    def __init__(self) -> None:
+        self.mix = np.empty(FRAME_SAMPLES, dtype=np.float32)
+        self.aux = np.empty(FRAME_SAMPLES, dtype=np.float32)
+        self.out = np.empty(FRAME_SAMPLES, dtype=np.int16)
+
+    def finish(self, n: int, clip: bool = True) -> bytes:
+        """mix[:n]을 (필요하면 소프트 클리핑 후) int16 바이트로 변환"""
+        mix = self.mix[:n]
+        if clip and (mix.max() > _INT16_MAX or mix.min() < -_INT16_MAX):
+            # 하드 클리핑 대신 tanh 곡선으로 부드럽게 눌러줌
+            np.multiply(mix, 1.0 / _INT16_MAX, out=mix)
+            np.tanh(mix, out=mix)
+            np.multiply(mix, _INT16_MAX, out=mix)
+        out = self.out[:n]
+        np.copyto(out, mix, casting="unsafe")
+        return out.tobytes()
+
+
+class NumpyVolumeTransformer(discord.AudioSource):
+    """PCMVolumeTransformer 대체: NumPy로 프레임 단위 게인/소프트 클리핑 적용"""
+
+    def __init__(self, original: discord.AudioSource, volume: float = 1.0) -> None:
+        if original.is_opus():
+            raise discord.ClientException("AudioSource must not be Opus encoded.")
+        self.original = original
+        self.volume = volume
+        self._buffers = _FrameBuffers()
+
+    @property
+    def volume(self) -> float:
+        return self._volume
+
+    @volume.setter
+    def volume(self, value: float) -> None:
+        self._volume = max(float(value), 0.0)
+
+    def read(self) -> bytes:
+        data = self.original.read()
+        if not data:
+            return b""
+        frame = np.frombuffer(data, dtype=np.int16)
+        n = frame.size
+        np.multiply(frame, self._volume, out=self._buffers.mix[:n], casting="unsafe")
+        # 게인이 1 이하면 int16 범위를 넘을 수 없으므로 클리핑 검사 생략
+        return self._buffers.finish(n, clip=self._volume > 1.0)
+
+    def cleanup(self) -> None:
+        self.original.cleanup()
+
+
+class CrossfadeSource(discord.AudioSource):
+    """나가는 곡의 끝과 들어오는 곡의 시작을 섞은 뒤 들어오는 곡을 그대로 전달
+
+    VoiceClient.source를 이 객체로 교체하면 기존 after 콜백은 들어오는 곡이
+    끝날 때 호출된다. volume은 들어오는 곡의 볼륨을 가리킨다.
+    """
+
+    def __init__(self, outgoing: discord.AudioSource, incoming: discord.AudioSource, frames: int) -> None:
+        self.outgoing: Optional[discord.AudioSource] = outgoing
+        self.incoming = incoming
+        self.frames = max(1, frames)
+        self._pos = 0
+        self._buffers = _FrameBuffers()
+
+    @property
+    def volume(self) -> float:
+        return self.incoming.volume
+
+    @volume.setter
+    def volume(self, value: float) -> None:
+        self.incoming.volume = value
+
+    @property
+    def mixing(self) -> bool:
+        return self.outgoing is not None
+
+    def _finish_fade(self) -> None:
+        if self.outgoing is not None:
+            self.outgoing.cleanup()
+            self.outgoing = None
+
+    def read(self) -> bytes:
+        if self.outgoing is None:
+            return self.incoming.read()
+        tail = self.outgoing.read()
+        head = self.incoming.read()
+        if not tail:
+            self._finish_fade()
+            return head
+        if not head:
+            self._finish_fade()
+            return tail
+        gain_in = min(1.0, (self._pos + 1) / self.frames)
+        self._pos += 1
+        a = np.frombuffer(tail, dtype=np.int16)
+        b = np.frombuffer(head, dtype=np.int16)
+        n = min(a.size, b.size)
+        mix = self._buffers.mix[:n]
+        aux = self._buffers.aux[:n]
+        np.multiply(a[:n], 1.0 - gain_in, out=mix, casting="unsafe")
+        np.multiply(b[:n], gain_in, out=aux, casting="unsafe")
+        np.add(mix, aux, out=mix)
+        if self._pos >= self.frames:
+            self._finish_fade()
+        return self._buffers.finish(n)
+
+    def cleanup(self) -> None:
+        self._finish_fade()
+        self.incoming.cleanup()
@@ -0,0 +1,142 @@
+"""자주 재생되는 곡을 위한 로컬 오디오 캐시"""
+from __future__ import annotations
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from .constants import AUDIO_CACHE_FILL_AFTER, AUDIO_CACHE_MAX_BYTES, DATA_DIR
+
+__all__ = ["AudioCache", "audio_cache"]
+
+logger = logging.getLogger(__name__)
+
+_PARTIAL_SUFFIXES = (".part", ".ytdl", ".tmp")
+
+
+class AudioCache:
+    """비디오 ID를 키로 하는 Opus/WebM 파일 캐시 (용량 제한 + LRU 삭제)
+
+    곡이 fill_after번 재생되면 백그라운드에서 파일을 채우고, 이후 재생은
+    YouTube 스트림 대신 로컬 파일을 사용한다. max_bytes가 0이면 비활성화.
+    재생 횟수는 아직 캐시되지 않은 곡만, 최근 max_tracked곡까지 기억한다.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        max_bytes: int = AUDIO_CACHE_MAX_BYTES,
+        fill_after: int = AUDIO_CACHE_FILL_AFTER,
+        max_tracked: int = 4096,
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.fill_after = fill_after
+        self.max_tracked = max_tracked
+        self._files: "OrderedDict[str, tuple[Path, int]]" = OrderedDict()
+        self._play_counts: "OrderedDict[str, int]" = OrderedDict()
+        self._filling: Set[str] = set()
+        self._total = 0
+        self._lock = threading.Lock()
+        self._scanned = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _scan(self) -> None:
+        """디스크의 기존 파일로 인덱스 재구성 (수정 시각 = 마지막 사용 시각)"""
+        if self._scanned:
+            return
+        self._scanned = True
+        self.root.mkdir(parents=True, exist_ok=True)
+        files = []
+        for path in self.root.iterdir():
+            if not path.is_file():
+                continue
+            if path.suffix in _PARTIAL_SUFFIXES:
+                path.unlink(missing_ok=True)
+                continue
+            stat = path.stat()
+            files.append((stat.st_mtime, path.stem, path, stat.st_size))
+        for _, video_id, path, size in sorted(files):
+            self._files[video_id] = (path, size)
+            self._total += size
+        self._evict()
+
+    def lookup(self, video_id: Optional[str]) -> Optional[Path]:
+        """캐시된 파일 경로 (없으면 None)"""
+        if not self.enabled or not video_id:
+            return None
+        with self._lock:
+            self._scan()
+            entry = self._files.get(video_id)
+            if entry is None:
+                return None
+            path, size = entry
+            if not path.exists():
+                self._files.pop(video_id, None)
+                self._total -= size
+                return None
+            self._files.move_to_end(video_id)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def record_play(self, video_id: Optional[str]) -> bool:
+        """재생 횟수 기록, 이번에 캐시를 채워야 하면 True"""
+        if not self.enabled or not video_id:
+            return False
+        with self._lock:
+            self._scan()
+            if video_id in self._files:
+                return False
+            count = self._play_counts.get(video_id, 0) + 1
+            self._play_counts[video_id] = count
+            self._play_counts.move_to_end(video_id)
+            while len(self._play_counts) > self.max_tracked:
+                self._play_counts.popitem(last=False)
+            if count < self.fill_after or video_id in self._filling:
+                return False
+            self._filling.add(video_id)
+            return True
+
+    def store(self, video_id: str, path: Path) -> None:
+        """다운로드 완료된 파일 등록 후 용량 초과분 정리"""
+        with self._lock:
+            self._filling.discard(video_id)
+            if not path.exists():
+                return
+            size = path.stat().st_size
+            old = self._files.pop(video_id, None)
+            if old is not None:
+                self._total -= old[1]
+            self._files[video_id] = (path, size)
+            self._total += size
+            # 캐시된 곡은 재생 횟수를 셀 필요가 없음 (삭제되면 처음부터 다시 셈)
+            self._play_counts.pop(video_id, None)
+            self._evict()
+
+    def abandon(self, video_id: str) -> None:
+        """채우기 실패 시 다음 재생에서 다시 시도할 수 있게 표시 해제"""
+        with self._lock:
+            self._filling.discard(video_id)
+
+    def _evict(self) -> None:
+        while self._total > self.max_bytes and self._files:
+            video_id, (path, size) = self._files.popitem(last=False)
+            self._total -= size
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"오디오 캐시 삭제 실패 ({video_id}): {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {"files": len(self._files), "bytes": self._total, "max_bytes": self.max_bytes}
+
+
+audio_cache = AudioCache(DATA_DIR / "audio_cache")
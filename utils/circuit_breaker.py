@@ -0,0 +1,152 @@
+"""연속 실패 시 외부 호출을 잠시 막는 서킷 브레이커"""
+from __future__ import annotations
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+
+from .constants import (
+    BREAKER_COOLDOWN,
+    BREAKER_THRESHOLD,
+    BREAKER_WINDOW,
+    LYRICS_BREAKER_COOLDOWN,
+    LYRICS_BREAKER_THRESHOLD,
+)
+
+__all__ = ["CircuitOpenError", "CircuitBreaker", "extraction_breaker", "lyrics_breaker"]
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ValueError):
+    """브레이커가 열려 있어 호출을 건너뜀 (ValueError이므로 사용자에게 그대로 표시됨)"""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f"{name} 요청이 연달아 실패해 잠시 중단했습니다. {int(retry_after) + 1}초 후 다시 시도해주세요")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """window초 안에 threshold번 실패하면 cooldown초 동안 호출 차단
+
+    cooldown이 지나면 한 번의 시험 호출(half-open)을 허용하고, 성공하면 다시
+    닫히고 실패하면 cooldown을 다시 시작한다. 모든 서버가 하나를 공유한다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        threshold: int = BREAKER_THRESHOLD,
+        window: float = BREAKER_WINDOW,
+        cooldown: float = BREAKER_COOLDOWN,
+    ) -> None:
+        self.name = name
+        self.threshold = max(1, threshold)
+        self.window = window
+        self.cooldown = cooldown
+        self._failures: deque = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh(time.monotonic())
+            return self._state
+
+    @property
+    def retry_after(self) -> float:
+        """다시 호출할 수 있을 때까지 남은 시간(초, 닫혀 있으면 0)"""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.cooldown - time.monotonic())
+
+    @property
+    def blocked(self) -> bool:
+        """지금 allow()를 호출하면 거절되는지 (시험 호출 자리를 차지하지 않음)
+
+        cooldown이 끝났어도 다른 호출자의 시험 호출이 진행 중이면 True다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refresh(now)
+            if self._state == CLOSED:
+                return False
+            if self._state == HALF_OPEN:
+                return self._probing and now - self._probe_started < self.cooldown
+            return True
+
+    def _refresh(self, now: float) -> None:
+        if self._state == OPEN and now - self._opened_at >= self.cooldown:
+            self._state = HALF_OPEN
+            self._probing = False
+
+    def allow(self) -> bool:
+        """호출해도 되면 True (half-open에서는 시험 호출 하나만 허용)"""
+        with self._lock:
+            self._refresh(time.monotonic())
+            if self._state == CLOSED:
+                return True
+            # 시험 호출이 결과를 남기지 못하고(취소 등) cooldown이 지나면 다시 허용
+            now = time.monotonic()
+            if self._state == HALF_OPEN and (not self._probing or now - self._probe_started >= self.cooldown):
+                self._probing = True
+                self._probe_started = now
+                return True
+            return False
+
+    def check(self) -> None:
+        """allow()가 False면 CircuitOpenError"""
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_after)
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"{self.name} 브레이커 닫힘")
+            self._state = CLOSED
+            self._probing = False
+            self._failures.clear()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._state == HALF_OPEN:
+                self._trip(now)
+                return
+            self._failures.append(now)
+            while self._failures and now - self._failures[0] > self.window:
+                self._failures.popleft()
+            if self._state == CLOSED and len(self._failures) >= self.threshold:
+                self._trip(now)
+
+    def _trip(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._probing = False
+        self._failures.clear()
+        self.trips += 1
+        logger.warning(f"{self.name} 브레이커 열림 ({self.cooldown:.0f}초 동안 호출 중단)")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh(time.monotonic())
+            return {"state": self._state, "recent_failures": len(self._failures), "trips": self.trips}
+
+
+extraction_breaker = CircuitBreaker("YouTube 추출")
+lyrics_breaker = CircuitBreaker(
+    "가사 조회",
+    threshold=LYRICS_BREAKER_THRESHOLD,
+    cooldown=LYRICS_BREAKER_COOLDOWN,
+)
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import os
 from pathlib import Path
 
 __all__ = [
@@ -8,6 +9,41 @@ __all__ = [
     "AUTO_SAVE_INTERVAL",
     "MAX_QUEUE_SIZE",
     "DEFAULT_VOLUME",
+    "PREFETCH_WINDOW",
+    "EXTRACTION_WORKERS",
+    "DOWNLOAD_WORKERS",
+    "AUDIO_CACHE_MAX_BYTES",
+    "AUDIO_CACHE_FILL_AFTER",
+    "PLAYER_MODE",
+    "BULK_RESOLVE_CONCURRENCY",
+    "TRACK_RETRY_BUDGET",
+    "TRACK_RETRY_BACKOFF",
+    "TRACK_RETRY_BACKOFF_MAX",
+    "BREAKER_THRESHOLD",
+    "BREAKER_WINDOW",
+    "BREAKER_COOLDOWN",
+    "NEGATIVE_CACHE_TTL",
+    "EARLY_END_MARGIN",
+    "STREAM_RECOVERY_ATTEMPTS",
+    "SEARCH_PAGE_SIZE",
+    "SEARCH_MAX_RESULTS",
+    "SEARCH_CACHE_TTL",
+    "HISTORY_SIZE",
+    "AUTOCOMPLETE_DEBOUNCE",
+    "AUTOCOMPLETE_TIMEOUT",
+    "HTTP_POOL_SIZE",
+    "HTTP_CONCURRENCY",
+    "HTTP_TIMEOUT",
+    "LYRICS_CACHE_TTL",
+    "LYRICS_MISS_TTL",
+    "LYRICS_CACHE_MAX_FILES",
+    "LYRICS_TIMEOUT",
+    "LYRICS_DURATION_TOLERANCE",
+    "LYRICS_BREAKER_THRESHOLD",
+    "LYRICS_BREAKER_COOLDOWN",
+    "LYRICS_PREFETCH_DEPTH",
+    "LYRICS_EDIT_RATE",
+    "LYRICS_EDIT_BURST",
 ]
 
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -24,4 +60,41 @@ COLORS = {
 DEFAULT_ACTIVITY_NAME: str = "Sick Sick"
 AUTO_SAVE_INTERVAL: int = 300
 MAX_QUEUE_SIZE: int = 50
-DEFAULT_VOLUME: float = 0.05
\ No newline at end of file
+DEFAULT_VOLUME: float = 0.05
+PREFETCH_WINDOW: float = 30.0
+EXTRACTION_WORKERS: int = 4
+DOWNLOAD_WORKERS: int = 2  # 노래방 전체 파일 다운로드 전용 (추출 워커와 별도)
+# 로컬 오디오 캐시 용량 (.env의 AUDIO_CACHE_MAX_MB, 기본 0 = 비활성화)
+AUDIO_CACHE_MAX_BYTES: int = int(os.getenv("AUDIO_CACHE_MAX_MB", "0")) * 1024 ** 2
+AUDIO_CACHE_FILL_AFTER: int = 3
+PLAYER_MODE: str = "pcm"  # 기본 출력 모드 (pcm/opus)
+BULK_RESOLVE_CONCURRENCY: int = 3
+TRACK_RETRY_BUDGET: int = 5  # 연속으로 실패한 곡이 이만큼이면 자동 재생 중단
+TRACK_RETRY_BACKOFF: float = 1.0
+TRACK_RETRY_BACKOFF_MAX: float = 30.0
+BREAKER_THRESHOLD: int = 8  # BREAKER_WINDOW초 안에 이만큼 실패하면 추출 중단
+BREAKER_WINDOW: float = 60.0
+BREAKER_COOLDOWN: float = 60.0
+NEGATIVE_CACHE_TTL: float = 6 * 3600  # 재생 불가로 분류된 곡을 다시 추출하지 않는 시간
+EARLY_END_MARGIN: float = 10.0  # 곡 길이보다 이만큼 이상 일찍 끝나면 스트림 끊김으로 판단
+STREAM_RECOVERY_ATTEMPTS: int = 2  # 곡당 스트림 재연결 시도 횟수
+SEARCH_PAGE_SIZE: int = 5
+SEARCH_MAX_RESULTS: int = 25
+SEARCH_CACHE_TTL: float = 600.0
+HISTORY_SIZE: int = 100  # 서버별로 보관하는 최근 재생 기록 수
+AUTOCOMPLETE_DEBOUNCE: float = 0.35  # 입력이 멈춘 뒤 온라인 검색을 시작하기까지 대기
+AUTOCOMPLETE_TIMEOUT: float = 2.0  # 디스코드 자동완성 응답 제한(3초) 안에 끝내기 위한 검색 대기 한도
+HTTP_POOL_SIZE: int = 20  # 공유 HTTP 클라이언트의 keep-alive 연결 수
+HTTP_CONCURRENCY: int = 8  # 동시에 보내는 외부 API 요청 수
+HTTP_TIMEOUT: float = 8.0
+LYRICS_CACHE_TTL: float = 30 * 24 * 3600
+LYRICS_MISS_TTL: float = 24 * 3600  # 가사가 없던 곡은 하루 뒤 다시 조회
+LYRICS_CACHE_MAX_FILES: int = 5000  # 디스크 가사 캐시 파일 수 상한 (오래 안 쓴 것부터 삭제)
+LYRICS_TIMEOUT: float = 4.0  # lrclib 요청 하나의 제한 시간
+LYRICS_DURATION_TOLERANCE: float = 10.0  # 곡 길이와 이보다 많이 다른 검색 결과는 버림
+LYRICS_BREAKER_THRESHOLD: int = 6  # 조회 한 번에 요청 두 개
+LYRICS_BREAKER_COOLDOWN: float = 120.0
+LYRICS_PREFETCH_DEPTH: int = 3  # 가사를 미리 조회해 둘 대기열 앞쪽 곡 수
+# 채널별 가사 메시지 수정 한도 (디스코드 채널 한도 약 5초에 5회 안쪽)
+LYRICS_EDIT_RATE: float = 0.8  # 초당 수정 횟수
+LYRICS_EDIT_BURST: int = 1
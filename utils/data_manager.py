@@ -3,6 +3,7 @@ import json
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from .constants import HISTORY_SIZE, PLAYER_MODE
 from .data_health_checker import create_health_checker
 
 if TYPE_CHECKING:
@@ -17,6 +18,9 @@ class DataManager:
         self.data_dir = Path(__file__).parent.parent / "data"
         self.playlists_file = self.data_dir / "playlists.json"
         self.settings_file = self.data_dir / "settings.json"
+        self.history_file = self.data_dir / "history.json"
+        # 재생 기록/플레이리스트가 바뀔 때마다 증가 (자동완성 색인 갱신용)
+        self.suggestion_version = 0
         
         self.data_dir.mkdir(exist_ok=True)
         self.health_checker = create_health_checker("Music")
@@ -24,6 +28,7 @@ class DataManager:
         
         self.bot.playlists = {}
         self.bot.guild_settings = {}
+        self.bot.play_history = {}
         self.bot.save_data = self.save_data
         self.bot.load_data = self.load_data
         self.bot.save_playlist_named = self.save_playlist_named
@@ -31,16 +36,19 @@ class DataManager:
         self.bot.list_playlists = self.list_playlists
     
     def _perform_health_check(self) -> None:
-        files = [str(self.playlists_file), str(self.settings_file)]
+        files = [str(self.playlists_file), str(self.settings_file), str(self.history_file)]
         self.health_checker.health_check_and_repair(files)
     
     def save_data(self) -> None:
         self.save_playlists()
         self.save_settings()
+        self.save_history()
     
     def load_data(self) -> None:
         self.load_playlists()
         self.load_settings()
+        self.load_history()
+        self.suggestion_version += 1
     
     def save_playlists(self) -> None:
         with open(self.playlists_file, "w", encoding="utf-8") as f:
@@ -72,6 +80,33 @@ class DataManager:
         with open(self.settings_file, "r", encoding="utf-8") as f:
             self.bot.guild_settings = json.load(f)
     
+    def save_history(self) -> None:
+        with open(self.history_file, "w", encoding="utf-8") as f:
+            json.dump(self.bot.play_history, f, indent=2, ensure_ascii=False)
+
+    def load_history(self) -> None:
+        if not self.history_file.exists():
+            self.bot.play_history = {}
+            return
+
+        with open(self.history_file, "r", encoding="utf-8") as f:
+            self.bot.play_history = json.load(f)
+
+        if not isinstance(self.bot.play_history, dict):
+            self.bot.play_history = {}
+
+    def record_play(self, guild_id: int, track: dict) -> None:
+        """재생 기록 추가 (최근 곡이 앞, 같은 곡은 한 번만, 저장은 자동 저장 때)"""
+        gid = str(guild_id)
+        url = track.get("webpage_url")
+        history = [t for t in self.bot.play_history.get(gid, []) if t.get("webpage_url") != url]
+        history.insert(0, track)
+        self.bot.play_history[gid] = history[:HISTORY_SIZE]
+        self.suggestion_version += 1
+
+    def get_play_history(self, guild_id: int) -> list[dict]:
+        return self.bot.play_history.get(str(guild_id), [])
+
     def get_guild_volume(self, guild_id: int) -> int:
         """서버 볼륨 설정 조회"""
         settings = self.bot.guild_settings.get(str(guild_id), {})
@@ -84,12 +119,37 @@ class DataManager:
         self.bot.guild_settings[str(guild_id)]["volume"] = volume
         self.save_settings()
 
+    def get_guild_player_mode(self, guild_id: int) -> str:
+        """서버 출력 모드 조회 (pcm: 일반, opus: Opus 직결)"""
+        settings = self.bot.guild_settings.get(str(guild_id), {})
+        return settings.get("player_mode", PLAYER_MODE)
+
+    def set_guild_player_mode(self, guild_id: int, mode: str) -> None:
+        """서버 출력 모드 저장"""
+        if str(guild_id) not in self.bot.guild_settings:
+            self.bot.guild_settings[str(guild_id)] = {}
+        self.bot.guild_settings[str(guild_id)]["player_mode"] = mode
+        self.save_settings()
+
+    def get_guild_crossfade(self, guild_id: int) -> int:
+        """서버 크로스페이드 길이(초) 조회, 0이면 사용 안 함"""
+        settings = self.bot.guild_settings.get(str(guild_id), {})
+        return settings.get("crossfade", 0)
+
+    def set_guild_crossfade(self, guild_id: int, seconds: int) -> None:
+        """서버 크로스페이드 길이 저장"""
+        if str(guild_id) not in self.bot.guild_settings:
+            self.bot.guild_settings[str(guild_id)] = {}
+        self.bot.guild_settings[str(guild_id)]["crossfade"] = seconds
+        self.save_settings()
+
     # 플레이리스트 유틸
     def save_playlist_named(self, guild_id: int, name: str, queue: list[dict]) -> None:
         gid = str(guild_id)
         if gid not in self.bot.playlists:
             self.bot.playlists[gid] = {}
         self.bot.playlists[gid][name] = queue
+        self.suggestion_version += 1
         self.save_playlists()
 
     def load_playlist_named(self, guild_id: int, name: str) -> list[dict] | None:
@@ -0,0 +1,118 @@
+"""yt-dlp 추출 전용 우선순위 실행기"""
+from __future__ import annotations
+import asyncio
+import concurrent.futures
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List
+
+from .constants import DOWNLOAD_WORKERS, EXTRACTION_WORKERS
+
+__all__ = [
+    "INTERACTIVE",
+    "BACKGROUND",
+    "ExtractionExecutor",
+    "extraction_executor",
+    "download_executor",
+]
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BACKGROUND = 1
+_LANE_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+_SHUTDOWN = 2
+
+
+class ExtractionExecutor:
+    """두 개의 우선순위 레인을 가진 스레드 풀
+
+    사용자가 기다리는 요청(INTERACTIVE)은 항상 백그라운드 작업(BACKGROUND,
+    프리페치/플레이리스트 준비 등)보다 먼저 처리된다. 스레드는 첫 작업이
+    들어올 때 생성된다.
+    """
+
+    def __init__(self, max_workers: int = EXTRACTION_WORKERS, name: str = "extraction") -> None:
+        self.max_workers = max(1, max_workers)
+        self.name = name
+        self._queue: "queue.PriorityQueue[tuple]" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._depth = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._waits = {INTERACTIVE: deque(maxlen=100), BACKGROUND: deque(maxlen=100)}
+        self._completed = 0
+        self._shutdown = False
+
+    def _ensure_workers(self) -> None:
+        while len(self._threads) < self.max_workers:
+            t = threading.Thread(
+                target=self._worker,
+                name=f"{self.name}-{len(self._threads)}",
+                daemon=True,
+            )
+            t.start()
+            self._threads.append(t)
+
+    def submit(self, fn: Callable[..., Any], *args: Any, priority: int = INTERACTIVE) -> concurrent.futures.Future:
+        fut: concurrent.futures.Future = concurrent.futures.Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("추출 실행기가 종료되었습니다")
+            self._ensure_workers()
+            self._depth[priority] += 1
+        self._queue.put((priority, next(self._seq), (fut, fn, args, time.monotonic())))
+        return fut
+
+    async def run(self, fn: Callable[..., Any], *args: Any, priority: int = INTERACTIVE) -> Any:
+        """이벤트 루프에서 await 가능한 형태로 실행"""
+        return await asyncio.wrap_future(self.submit(fn, *args, priority=priority))
+
+    def _worker(self) -> None:
+        while True:
+            priority, _, item = self._queue.get()
+            if item is None:
+                break
+            fut, fn, args, enqueued_at = item
+            with self._lock:
+                self._depth[priority] -= 1
+                self._waits[priority].append(time.monotonic() - enqueued_at)
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args)
+            except BaseException as e:
+                fut.set_exception(e)
+            else:
+                fut.set_result(result)
+            with self._lock:
+                self._completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """레인별 대기열 깊이와 최근 대기 시간(초)"""
+        with self._lock:
+            result: Dict[str, Any] = {"workers": self.max_workers, "completed": self._completed}
+            for lane, name in _LANE_NAMES.items():
+                waits = self._waits[lane]
+                result[f"{name}_depth"] = self._depth[lane]
+                result[f"{name}_avg_wait"] = sum(waits) / len(waits) if waits else 0.0
+                result[f"{name}_max_wait"] = max(waits) if waits else 0.0
+            return result
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            threads = list(self._threads)
+        for _ in threads:
+            self._queue.put((_SHUTDOWN, next(self._seq), None))
+
+
+extraction_executor = ExtractionExecutor()
+# 노래방처럼 파일 전체를 받는 긴 작업은 별도 풀에서 (재생 추출 워커를 차지하지 않도록)
+download_executor = ExtractionExecutor(DOWNLOAD_WORKERS, name="download")
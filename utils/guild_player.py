@@ -0,0 +1,808 @@
+"""서버별 재생 상태를 소유하는 GuildPlayer 액터"""
+from __future__ import annotations
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import discord
+
+from .audio import FRAME_SECONDS, CrossfadeSource
+from .audio_cache import audio_cache
+from .circuit_breaker import CircuitOpenError, extraction_breaker
+from .constants import (
+    DEFAULT_VOLUME,
+    EARLY_END_MARGIN,
+    LYRICS_PREFETCH_DEPTH,
+    PLAYER_MODE,
+    STREAM_RECOVERY_ATTEMPTS,
+    PREFETCH_WINDOW,
+    TRACK_RETRY_BACKOFF,
+    TRACK_RETRY_BACKOFF_MAX,
+    TRACK_RETRY_BUDGET,
+)
+from .embed_factory import embed_error, embed_info
+from .extraction_executor import BACKGROUND
+from .guild_queue import GuildQueue, QueueFullError
+from .lyrics_renderer import lyrics_renderer
+from .lyrics_sync import fetch_lrc
+from .resolve_cache import resolution_cache
+from .sources import YTDLOpusSource, YTDLSource
+from .track import Track
+
+__all__ = ["GuildPlayer"]
+
+logger = logging.getLogger(__name__)
+
+_Handler = Callable[..., Awaitable[Any]]
+
+
+class _StopRequested(ValueError):
+    """곡을 준비하는 동안 중지 요청이 들어와 준비한 곡을 버림"""
+
+    def __init__(self) -> None:
+        super().__init__("재생이 중지되었습니다")
+
+
+class GuildPlayer:
+    """한 서버의 대기열, 음성 연결, 재생 시계, 가사/프리페치 Task를 소유하는 액터
+
+    재생 상태를 바꾸는 요청(재생, 건너뛰기, 중지, 곡 종료 콜백 등)은 모두
+    inbox에 넣어 하나의 worker Task가 순서대로 처리한다. 그래서 버튼을 여러 번
+    눌러도 같은 곡 전환이 두 번 일어나거나 FFmpeg가 중복 실행되지 않는다.
+    상태 조회는 속성을 바로 읽으면 된다.
+    """
+
+    def __init__(self, bot: discord.Bot, guild_id: int) -> None:
+        self.bot = bot
+        self.guild_id = guild_id
+        self.queue = GuildQueue()
+        self.current: Optional[discord.AudioSource] = None
+        self.loop_mode = "off"
+        self.lyrics_task: Optional[asyncio.Task] = None
+        # Track.key -> 가사 조회 Task (현재 곡 + 대기열 앞쪽 LYRICS_PREFETCH_DEPTH곡)
+        self._lyrics: Dict[str, asyncio.Task] = {}
+        # 재생 요청이 들어온 텍스트 채널 (건너뛴 곡 요약, 싱크 가사를 보낼 곳)
+        self.text_channel: Optional[discord.abc.Messageable] = None
+        # 연속 재생 실패 수, 아직 알리지 않은 건너뛴 곡, 재시도 예약
+        self._failures = 0
+        self._skipped: List[Tuple[Track, str]] = []
+        self._retry_handle: Optional[asyncio.TimerHandle] = None
+        # 현재 곡의 스트림 끊김 복구 횟수
+        self._recoveries = 0
+        self._prefetch_task: Optional[asyncio.Task] = None
+        self._prefetched: Optional[Tuple[Track, dict]] = None
+        # voice_client.play() 호출마다 증가, 오래된 after 콜백을 걸러냄
+        self._play_id = 0
+        self._inbox: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._closed = False
+        # 받은/처리한 중지 요청 번호와 worker가 준비 중인 소스 (중지 시 바로 취소)
+        self._stop_requests = 0
+        self._stops_handled = 0
+        self._preparing: Optional[asyncio.Future] = None
+
+    def __repr__(self) -> str:
+        return f"<GuildPlayer {self.guild_id} queue={len(self.queue)} playing={self.current is not None}>"
+
+    # ----- 조회 -----
+
+    @property
+    def voice_client(self) -> Optional[discord.VoiceClient]:
+        guild = self.bot.get_guild(self.guild_id)
+        return guild.voice_client if guild else None
+
+    @property
+    def is_active(self) -> bool:
+        """음성 연결이 재생 중이거나 일시정지 상태 (노래방처럼 플레이어 밖의 소스 포함)"""
+        vc = self.voice_client
+        return vc is not None and (vc.is_playing() or vc.is_paused())
+
+    @property
+    def default_volume(self) -> float:
+        dm = getattr(self.bot, "data_manager", None)
+        return dm.get_guild_volume(self.guild_id) / 100 if dm else DEFAULT_VOLUME
+
+    @property
+    def mode(self) -> str:
+        dm = getattr(self.bot, "data_manager", None)
+        return dm.get_guild_player_mode(self.guild_id) if dm else PLAYER_MODE
+
+    @property
+    def retry_pending(self) -> bool:
+        """곡 재생 실패 후 다음 곡 재시도를 기다리는 중"""
+        return self._retry_handle is not None
+
+    def elapsed(self) -> float:
+        """현재 곡 재생 위치(초)
+
+        소스가 실제로 내보낸 프레임 수 기준이라 일시정지, 탐색, 재시작,
+        스트림 재연결을 따로 보정할 필요가 없다.
+        """
+        return getattr(self.current, "position", 0.0)
+
+    # ----- 메시지 처리 -----
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run(), name=f"guild-player-{self.guild_id}")
+
+    async def _call(self, handler: _Handler, *args: Any) -> Any:
+        """handler를 worker 차례에 실행하고 결과를 기다림"""
+        if self._closed:
+            raise ValueError("플레이어가 종료되었습니다. 다시 시도해주세요")
+        fut = asyncio.get_event_loop().create_future()
+        self._inbox.put_nowait((handler, args, fut))
+        self._ensure_worker()
+        return await fut
+
+    def _post(self, handler: _Handler, *args: Any) -> None:
+        """결과를 기다리지 않는 메시지 (이벤트 루프 스레드에서만 호출)"""
+        if self._closed:
+            return
+        self._inbox.put_nowait((handler, args, None))
+        self._ensure_worker()
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._inbox.get()
+            if item is None:
+                break
+            handler, args, fut = item
+            if fut is not None and fut.done():
+                continue  # 요청한 쪽이 이미 취소됨
+            try:
+                result = await handler(*args)
+            except Exception as e:
+                if fut is None:
+                    logger.error(f"플레이어 처리 오류 ({self.guild_id}, {handler.__name__}): {e}", exc_info=e)
+                elif not fut.done():
+                    fut.set_exception(e)
+            else:
+                if fut is not None and not fut.done():
+                    fut.set_result(result)
+        # 종료 후 남은 요청은 실패 처리
+        while not self._inbox.empty():
+            item = self._inbox.get_nowait()
+            if item and item[2] is not None and not item[2].done():
+                item[2].set_exception(ValueError("플레이어가 종료되었습니다. 다시 시도해주세요"))
+
+    def _after_callback(self, play_id: int) -> Callable[[Optional[Exception]], None]:
+        """음성 스레드에서 호출되는 after 콜백 -> 루프로 곡 종료 메시지 전달"""
+        def after(error: Optional[Exception]) -> None:
+            if error:
+                logger.error(f"재생 중 오류 발생: {error}")
+            try:
+                self.bot.loop.call_soon_threadsafe(self._post, self._on_track_end, play_id)
+            except RuntimeError:
+                pass  # 루프 종료 중
+        return after
+
+    # ----- 공개 요청 -----
+
+    async def play(
+        self, tracks: Iterable[Track], *, channel: Optional[discord.abc.Messageable] = None
+    ) -> Tuple[bool, int]:
+        """곡 추가, 재생 중이 아니면 첫 곡을 바로 재생 -> (바로 재생했는지, 받아들인 곡 수)
+
+        대기열이 가득 차면 들어가지 못한 뒤쪽 곡은 버리고 받아들인 곡 수에서
+        뺀다 (한 곡도 받지 못하면 QueueFullError). 예외가 나면 tracks 중 대기열에
+        남은 곡은 없다. tracks가 비어 있으면 대기열 첫 곡부터 재생한다.
+        channel을 주면 이후 재생 실패 요약을 그 채널로 보낸다.
+        """
+        if channel is not None:
+            self.text_channel = channel
+        return await self._call(self._handle_play, list(tracks))
+
+    async def skip(self, expected: Optional[discord.AudioSource] = None) -> bool:
+        """현재 곡 건너뛰기 (expected가 이미 넘어간 곡이면 아무것도 하지 않음)"""
+        return await self._call(self._handle_skip, expected)
+
+    async def stop(self, *, disconnect: bool = True) -> int:
+        """재생 중지 + 대기열 비우기 (+ 연결 해제), 지운 대기열 곡 수 반환
+
+        worker가 다음 곡의 스트림을 해석하는 중이면 끝날 때까지 기다리지 않도록
+        그 준비를 바로 취소한다 (준비가 이미 끝났어도 재생하지 않고 버림).
+        """
+        self._stop_requests += 1
+        request = self._stop_requests
+        if self._preparing is not None:
+            self._preparing.cancel()
+        try:
+            return await self._call(self._handle_stop, disconnect, request)
+        finally:
+            # 요청이 취소되거나 실패해 처리되지 못했어도 이후 재생을 막지 않도록
+            self._stops_handled = max(self._stops_handled, request)
+
+    async def pause(self) -> bool:
+        return await self._call(self._handle_pause)
+
+    async def resume(self) -> bool:
+        return await self._call(self._handle_resume)
+
+    async def restart_opus(self, volume: Optional[float] = None) -> bool:
+        """Opus 직결 소스를 현재 위치에서 다시 시작 (실시간 볼륨 변경용)"""
+        return await self._call(self._handle_restart_opus, volume)
+
+    async def seek(self, position: float) -> bool:
+        """현재 곡의 position초로 이동 (재생 중인 곡이 없으면 False)"""
+        return await self._call(self._handle_seek, position)
+
+    # ----- 대기열 편집 (동기 처리, 첫 곡이 바뀌면 프리페치 재예약) -----
+
+    def remove(self, index: int) -> Track:
+        track = self.queue.pop(index)
+        if index == 0:
+            self.invalidate_prefetch()
+        else:
+            self._prefetch_lyrics()
+        return track
+
+    def shuffle(self) -> None:
+        self.queue.shuffle()
+        self.invalidate_prefetch()
+
+    def clear_queue(self) -> int:
+        count = len(self.queue)
+        self.queue.clear()
+        self.invalidate_prefetch(reschedule=False)
+        self._prefetch_lyrics()
+        return count
+
+    def replace_queue(self, tracks: Iterable[Track]) -> None:
+        self.queue.replace(tracks)
+        self.invalidate_prefetch()
+
+    # ----- 핸들러 (worker에서만 실행) -----
+
+    async def _handle_play(self, tracks: List[Track]) -> Tuple[bool, int]:
+        vc = self.voice_client
+        if not vc or not vc.is_connected():
+            raise ValueError("음성 연결이 끊어졌습니다")
+        if self.is_active:
+            # 요청한 쪽이 확인한 뒤 다른 명령으로 대기열이 찼을 수 있음 - 들어가는 만큼만
+            if tracks and not self.queue.room:
+                raise QueueFullError(self.queue.capacity)
+            accepted = tracks[:self.queue.room]
+            self.queue.extend(accepted)
+            self.schedule_prefetch()
+            return False, len(accepted)
+        if not tracks:
+            await self._advance()
+            return self.current is not None, 0
+        first, rest = tracks[0], tracks[1:]
+        # 재생목록 나머지 곡은 먼저 대기열로 (포맷 해석은 프리페치 시점에, 첫 곡이 실패해도 유지)
+        queued = rest[:self.queue.room]
+        self.queue.extend(queued)
+        try:
+            await self._start(first, requested=True)
+        except _StopRequested:
+            raise
+        except CircuitOpenError as e:
+            if not self.queue:
+                raise
+            self._schedule_retry(max(e.retry_after, TRACK_RETRY_BACKOFF))
+            if not self.queue.room and queued:
+                # 첫 곡을 되돌릴 자리를 위해 방금 넣은 마지막 곡을 뺌
+                self.queue.pop()
+                queued = queued[:-1]
+            if not self.queue.room:
+                raise  # 대기열의 다른 곡만 재개 후 재생
+            self.queue.appendleft(first)
+            return False, len(queued) + 1
+        except Exception as e:
+            # 재생할 곡이 더 없으면 오류를 그대로 요청한 명령어에 표시
+            if not self.queue:
+                raise
+            logger.error(f"첫 곡 재생 실패 ({first.title}): {e}")
+            self._failures += 1
+            self._skipped.append((first, str(e)))
+            await self._advance()
+            return self.current is not None, len(queued) + 1
+        self.schedule_prefetch()
+        return True, len(queued) + 1
+
+    async def _handle_skip(self, expected: Optional[discord.AudioSource]) -> bool:
+        vc = self.voice_client
+        if not vc or not vc.is_connected() or not (vc.is_playing() or vc.is_paused()):
+            return False
+        if expected is not None and self.current is not expected:
+            return False
+        if self.current is None:
+            vc.stop()  # 노래방 등 플레이어 밖에서 시작한 재생
+            return True
+        self._stop_playback()
+        # 다음 곡 준비는 별도 메시지로 -> 건너뛰기 응답은 바로 돌아감
+        # (그 사이 다른 요청이 새 곡을 시작했으면 play_id가 달라져 무시됨)
+        self._post(self._on_track_end, self._play_id, False)
+        return True
+
+    async def _handle_stop(self, disconnect: bool, request: int = 0) -> int:
+        self._stops_handled = max(self._stops_handled, request)
+        count = len(self.queue)
+        self._reset()
+        vc = self.voice_client
+        if disconnect and vc:
+            try:
+                await vc.disconnect(force=False)
+            except Exception:
+                pass
+        return count
+
+    async def _handle_pause(self) -> bool:
+        vc = self.voice_client
+        if not vc or not vc.is_playing():
+            return False
+        vc.pause()
+        return True
+
+    async def _handle_resume(self) -> bool:
+        vc = self.voice_client
+        if not vc or not vc.is_paused():
+            return False
+        vc.resume()
+        return True
+
+    async def _handle_restart_opus(self, volume: Optional[float]) -> bool:
+        if not isinstance(self.current, YTDLOpusSource):
+            return False
+        return await self._restart(volume=volume)
+
+    async def _handle_seek(self, position: float) -> bool:
+        source = self.current
+        if not isinstance(source, (YTDLSource, YTDLOpusSource)):
+            return False
+        if source.duration and position >= source.duration:
+            raise ValueError("곡 길이를 넘는 위치입니다")
+        return await self._restart(start=max(0.0, position))
+
+    async def _restart(self, *, volume: Optional[float] = None, start: Optional[float] = None) -> bool:
+        """현재 곡의 FFmpeg를 다시 시작 (이미 해석한 스트림 URL 재사용, 만료됐을 때만 다시 해석)
+
+        after 콜백(play_id)은 그대로 두고 소스만 교체하므로 곡 종료 처리와
+        대기열은 영향을 받지 않고, 재생 시계는 새 시작 위치부터 이어진다.
+        """
+        vc = self.voice_client
+        source = self.current
+        if not vc or vc.source is None or not (vc.is_playing() or vc.is_paused()):
+            return False
+        filename = None
+        if not source.local and not resolution_cache.stream_valid(source.data):
+            fresh = await YTDLSource._resolve(source.webpage_url, loop=self.bot.loop, need_stream=True)
+            filename = fresh["url"]
+        new_source = source.restarted(volume=volume, filename=filename, start=start)
+        # 소스를 바꾸면 AudioPlayer가 항상 재생을 재개하므로 일시정지 상태를 되돌림
+        paused = vc.is_paused()
+        old, vc.source = vc.source, new_source
+        if paused:
+            vc.pause()
+        old.cleanup()
+        self.current = new_source
+        # 위치가 바뀌었으므로 프리페치/크로스페이드 시점 다시 계산
+        self.invalidate_prefetch()
+        return True
+
+    async def _on_track_end(self, play_id: int, natural: bool = True) -> None:
+        """곡 종료 처리 (natural: 재생이 스스로 끝남 - 건너뛰기/재시도가 아님)"""
+        # 건너뛰기/중지/교체로 이미 처리된 곡의 콜백은 무시
+        if play_id != self._play_id:
+            return
+        if natural and await self._recover_stream():
+            return
+        await self._advance()
+
+    async def _recover_stream(self) -> bool:
+        """곡이 길이보다 한참 일찍 끝났으면 스트림을 다시 해석해 끊긴 위치부터 재시작
+
+        만료된 googlevideo URL이나 403은 FFmpeg의 -reconnect로 복구되지 않아
+        곡이 중간에 끝난 것처럼 보인다. 재생 시계는 끊긴 위치에서 이어지므로
+        가사 싱크와 대기열은 그대로 유지된다.
+        """
+        source = self.current
+        if not isinstance(source, (YTDLSource, YTDLOpusSource)) or source.local:
+            return False
+        if not source.duration or self._recoveries >= STREAM_RECOVERY_ATTEMPTS:
+            return False
+        position = source.position
+        if source.duration - position < EARLY_END_MARGIN:
+            return False
+        vc = self.voice_client
+        if not vc or not vc.is_connected():
+            return False
+        self._recoveries += 1
+        logger.warning(f"스트림이 일찍 끝남 ({source.title}, {position:.0f}/{source.duration}초), 재연결 시도 {self._recoveries}회")
+        # 만료된 스트림 URL이 해석 캐시에 남아 있으면 재사용되지 않도록 폐기
+        resolution_cache.invalidate(source.webpage_url)
+        mode = "opus" if isinstance(source, YTDLOpusSource) else "pcm"
+        try:
+            new_source = await self._prepare(source.track, volume=source.volume, mode=mode, start=position)
+        except _StopRequested:
+            return True  # 곧 처리될 중지 요청에 맡김
+        except Exception as e:
+            logger.error(f"스트림 재연결 실패 ({source.title}): {e}")
+            return False
+        vc = self.voice_client
+        if self._closed or self.current is not source or not vc or not vc.is_connected():
+            new_source.cleanup()
+            return self.current is not source
+        self._stop_playback()
+        vc.play(new_source, after=self._after_callback(self._play_id))
+        self.current = new_source
+        # 크로스페이드 예약은 교체된 소스를 기준으로 다시 계산
+        self.invalidate_prefetch()
+        return True
+
+    # ----- 재생 전환 -----
+
+    def _next_track(self) -> Optional[Track]:
+        if self.loop_mode == "one" and self.current is not None:
+            return self.current.track
+        if not self.queue:
+            return None
+        track = self.queue.popleft()
+        # 대기열 반복 모드 - 재생한 곡을 대기열 끝에 추가
+        if self.loop_mode == "all":
+            self.queue.append(track)
+        return track
+
+    async def _advance(self) -> None:
+        """다음 곡 재생 (재생할 곡이 없으면 연결 종료)
+
+        곡 준비에 실패하면 그 곡을 건너뛰고 지수 백오프 후 다음 곡을 시도한다.
+        재시도는 타이머로 다시 메시지를 보내는 방식이라 기다리는 동안에도
+        건너뛰기/중지 요청은 바로 처리된다. 스트림 해석 중에는 worker가 그
+        결과를 기다리므로, 중지 요청은 stop()이 해석을 바로 취소하는 방식으로
+        처리된다. TRACK_RETRY_BUDGET곡 연속으로 실패하면 재생을 중지한다.
+        """
+        self._cancel_retry()
+        if self._stop_pending:
+            return  # 곧 처리될 중지 요청에 맡김
+        vc = self.voice_client
+        if not vc or not vc.is_connected():
+            self._reset()
+            if vc:
+                try:
+                    await vc.disconnect(force=True)
+                except Exception:
+                    pass
+            return
+        # 추출이 전체적으로 중단된 동안에는 곡을 소모하지 않고 재개 시점까지 대기
+        # (cooldown이 끝났어도 다른 서버의 시험 호출이 진행 중이면 계속 대기)
+        if extraction_breaker.blocked and (self.queue or self.loop_mode == "one" and self.current is not None):
+            self._schedule_retry(max(extraction_breaker.retry_after, TRACK_RETRY_BACKOFF))
+            return
+        track = self._next_track()
+        if track is None:
+            await self._finish()
+            return
+        try:
+            await self._start(track, data=self._take_prefetched(track))
+        except _StopRequested:
+            return
+        except CircuitOpenError as e:
+            # 확인한 뒤 다른 서버가 시험 호출을 차지함 - 곡을 되돌려 놓고 대기 (실패로 세지 않음)
+            self._requeue(track)
+            self._schedule_retry(max(e.retry_after, TRACK_RETRY_BACKOFF))
+            return
+        except Exception as e:
+            logger.error(f"다음 곡 재생 실패 ({track.title}): {e}")
+            # 현재곡 반복 중 실패하면 같은 곡을 계속 재시도하지 않도록
+            self.current = None
+            self._failures += 1
+            self._skipped.append((track, str(e)))
+            if self._failures >= TRACK_RETRY_BUDGET:
+                await self._finish(f"{self._failures}곡 연속으로 재생에 실패해 재생을 중지했습니다")
+                return
+            self._schedule_retry(min(TRACK_RETRY_BACKOFF_MAX, TRACK_RETRY_BACKOFF * 2 ** (self._failures - 1)))
+            return
+        self._update_status()
+
+    def _requeue(self, track: Track) -> None:
+        """_next_track()으로 꺼낸 곡을 대기열 맨 앞으로 되돌림"""
+        if self.loop_mode == "one" and getattr(self.current, "track", None) is track:
+            return  # 꺼내지 않고 현재 곡을 다시 쓴 경우
+        if self.loop_mode == "all" and self.queue and self.queue[-1] is track:
+            self.queue.pop()
+        self.queue.appendleft(track)
+
+    async def _finish(self, reason: Optional[str] = None) -> None:
+        """재생 종료 + 연결 해제 (건너뛴 곡이 있으면 요약 전송)"""
+        self._report_skipped(reason)
+        self._reset()
+        vc = self.voice_client
+        if vc:
+            try:
+                await vc.disconnect(force=False)
+            except Exception:
+                pass
+        self._update_status()
+
+    def _schedule_retry(self, delay: float) -> None:
+        # 그 사이 다른 요청이 재생을 바꾸면 play_id가 달라져 재시도는 무시됨
+        loop = asyncio.get_event_loop()
+        self._retry_handle = loop.call_later(delay, self._post, self._on_track_end, self._play_id, False)
+
+    def _cancel_retry(self) -> None:
+        handle, self._retry_handle = self._retry_handle, None
+        if handle:
+            handle.cancel()
+
+    def _report_skipped(self, reason: Optional[str] = None) -> None:
+        """쌓인 건너뛴 곡을 한 번의 메시지로 알림"""
+        skipped, self._skipped = self._skipped, []
+        self._failures = 0
+        if not skipped or self.text_channel is None:
+            return
+        lines = [f"`{i}.` [{track.title or track.url}]({track.url}) - {error[:80]}" for i, (track, error) in enumerate(skipped[:10], 1)]
+        if len(skipped) > 10:
+            lines.append(f"*+{len(skipped) - 10}곡 더*")
+        if reason:
+            lines.append(f"\n{reason}")
+        embed = embed_error("\n".join(lines), title=f" 재생하지 못한 곡 {len(skipped)}개")
+        asyncio.create_task(self._send(self.text_channel, embed))
+
+    @staticmethod
+    async def _send(channel: discord.abc.Messageable, embed: discord.Embed) -> Optional[discord.Message]:
+        try:
+            return await channel.send(embed=embed)
+        except Exception as e:
+            logger.warning(f"메시지 전송 실패: {e}")
+            return None
+
+    async def _start(self, track: Track, *, data: Optional[dict] = None, requested: bool = False) -> None:
+        """track 재생 시작 (프리페치/캐시가 유효하면 재사용)
+
+        requested: 사용자가 바로 재생을 요청한 곡 (가사가 없으면 알림)
+        """
+        source = await self._prepare(track, volume=self.default_volume, data=data, mode=self.mode, start=track.start)
+        vc = self.voice_client
+        if self._closed or not vc or not vc.is_connected():
+            source.cleanup()
+            raise ValueError("음성 연결이 끊어졌습니다")
+        self._stop_playback()
+        vc.play(source, after=self._after_callback(self._play_id))
+        self._track_started(track, source, requested=requested)
+
+    @property
+    def _stop_pending(self) -> bool:
+        """worker가 아직 처리하지 않은 중지 요청이 있는지"""
+        return self._stop_requests > self._stops_handled
+
+    async def _prepare(self, track: Track, **kwargs: Any) -> discord.AudioSource:
+        """worker에서 재생 소스 준비 (stop()이 취소할 수 있음, 중지 요청이 있으면 _StopRequested)"""
+        if self._stop_pending:
+            raise _StopRequested()
+        prepare = asyncio.ensure_future(YTDLSource.prepare_player(track, loop=self.bot.loop, **kwargs))
+        self._preparing = prepare
+        try:
+            await asyncio.wait({prepare})
+        except BaseException:
+            prepare.cancel()
+            raise
+        finally:
+            self._preparing = None
+        if prepare.cancelled():
+            raise _StopRequested()
+        source = prepare.result()
+        if self._stop_pending:
+            source.cleanup()
+            raise _StopRequested()
+        return source
+
+    def _track_started(self, track: Track, source: discord.AudioSource, *, requested: bool = False) -> None:
+        """새 곡으로 전환된 뒤 공통 처리 (일반 시작과 크로스페이드 모두)"""
+        self.current = source
+        self._recoveries = 0
+        dm = getattr(self.bot, "data_manager", None)
+        if dm:
+            dm.record_play(self.guild_id, {"webpage_url": track.url, "title": track.title})
+        YTDLSource.record_play(track)
+        self._show_lyrics(track, announce_missing=requested)
+        self._cancel_retry()
+        self.invalidate_prefetch()
+        self._report_skipped()
+
+    def _stop_playback(self) -> None:
+        """현재 재생 중단 (중단된 곡의 after 콜백은 무시되도록 play_id 증가)"""
+        self._play_id += 1
+        vc = self.voice_client
+        if vc and (vc.is_playing() or vc.is_paused()):
+            vc.stop()
+
+    def _reset(self) -> None:
+        self._cancel_retry()
+        self._skipped.clear()
+        self._failures = 0
+        self._stop_playback()
+        self.queue.clear()
+        self.current = None
+        self._cancel_lyrics()
+        self.invalidate_prefetch(reschedule=False)
+        self._prefetch_lyrics()
+
+    def _cancel_lyrics(self) -> None:
+        task, self.lyrics_task = self.lyrics_task, None
+        if task and not task.done():
+            task.cancel()
+
+    # ----- 싱크 가사 -----
+
+    def _lyrics_lookup(self, track: Track) -> asyncio.Task:
+        """track의 가사 조회 Task (미리 시작했으면 그대로, 없으면 새로 시작)"""
+        task = self._lyrics.get(track.key)
+        if task is None or task.cancelled():
+            task = asyncio.ensure_future(fetch_lrc(track.title, duration=track.duration))
+            # 기다리는 쪽 없이 끝나도 경고가 남지 않도록
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._lyrics[track.key] = task
+        return task
+
+    def _prefetch_lyrics(self) -> None:
+        """현재 곡과 대기열 앞쪽 곡의 가사를 백그라운드에서 미리 조회
+
+        범위를 벗어난 곡(건너뜀/대기열에서 빠짐)의 조회와 결과는 버린다. 가사
+        자체는 lyrics_cache에 남으므로 다시 범위에 들어오면 바로 채워진다.
+        """
+        wanted: List[Track] = []
+        current_track = getattr(self.current, "track", None)
+        if current_track is not None:
+            wanted.append(current_track)
+        if not self._closed:
+            wanted.extend(self.queue[:LYRICS_PREFETCH_DEPTH])
+        keys = {track.key for track in wanted}
+        for key in [key for key in self._lyrics if key not in keys]:
+            task = self._lyrics.pop(key)
+            if not task.done():
+                task.cancel()
+        for track in wanted:
+            if track.title:
+                self._lyrics_lookup(track)
+
+    def _show_lyrics(self, track: Track, *, announce_missing: bool = False) -> None:
+        """재생 시계에 맞춰 track의 싱크 가사 표시 시작 (이전 곡 가사 표시는 중단)"""
+        self._cancel_lyrics()
+        if self.text_channel is None or not track.title:
+            return
+        lookup = self._lyrics_lookup(track)
+        self.lyrics_task = asyncio.create_task(self._display_lyrics(lookup, track, announce_missing))
+
+    async def _display_lyrics(self, lookup: asyncio.Task, track: Track, announce_missing: bool) -> None:
+        channel = self.text_channel
+        try:
+            # 표시가 취소돼도 조회는 계속 (같은 곡 반복 재생 시 재사용)
+            lyrics = await asyncio.shield(lookup)
+            # 곡이 바뀌면 이 Task는 취소되므로, 소스 객체가 아닌 곡으로 비교
+            # (탐색/재시작/스트림 재연결은 같은 곡의 소스만 교체함)
+            current_track = getattr(self.current, "track", None)
+            if current_track is None or current_track.key != track.key:
+                return
+            if not lyrics:
+                if announce_missing:
+                    await self._send(channel, embed_info("싱크 가사를 찾을 수 없습니다."))
+                return
+            message = await self._send(channel, embed_info("싱크 가사 준비 중..."))
+            if message is None:
+                return
+            # 플레이어 재생 시계 기준 (일시정지/탐색/스트림 재연결을 그대로 따라감)
+            await lyrics_renderer.run(message, lyrics, self.elapsed)
+        except asyncio.CancelledError:
+            logger.debug("가사 Task 취소됨")
+        except Exception as e:
+            logger.error(f"가사 표시 오류: {e}")
+
+    def _update_status(self) -> None:
+        try:
+            asyncio.create_task(self.bot._update_status())
+        except Exception as e:
+            logger.error(f"상태 업데이트 실패: {e}")
+
+    # ----- 프리페치 / 크로스페이드 -----
+
+    def schedule_prefetch(self) -> None:
+        """현재 곡 종료 PREFETCH_WINDOW초 전에 대기열 첫 곡의 스트림을 미리 해석
+
+        대기열 앞쪽 곡의 가사 조회도 여기서 함께 맞춘다 (대기열이 바뀔 때마다 호출됨).
+        """
+        self._prefetch_lyrics()
+        if self._closed or (self._prefetch_task and not self._prefetch_task.done()):
+            return
+        head = self.queue.peek()
+        if head is None or self.current is None:
+            return
+        if self._prefetched and self._prefetched[0] is head and resolution_cache.stream_valid(self._prefetched[1]):
+            return
+        delay = 0.0
+        if self.current.duration:
+            delay = max(0.0, self.current.duration - self.elapsed() - PREFETCH_WINDOW)
+        self._prefetch_task = asyncio.create_task(self._prefetch_head(head, delay))
+
+    def invalidate_prefetch(self, *, reschedule: bool = True) -> None:
+        """대기열 편집 시 프리페치 결과 폐기 (필요하면 새 첫 곡으로 다시 예약)"""
+        self._prefetched = None
+        task, self._prefetch_task = self._prefetch_task, None
+        if task and not task.done():
+            task.cancel()
+        if reschedule:
+            self.schedule_prefetch()
+
+    def _take_prefetched(self, track: Track) -> Optional[dict]:
+        """track용으로 준비된 스트림 info 반환 (만료/불일치면 None)"""
+        prefetched, self._prefetched = self._prefetched, None
+        if not prefetched or prefetched[0] is not track:
+            return None
+        return prefetched[1] if resolution_cache.stream_valid(prefetched[1]) else None
+
+    async def _prefetch_head(self, head: Track, delay: float) -> None:
+        try:
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.queue.peek() is not head:
+                return
+            version = self.queue.version
+            if audio_cache.lookup(head.id) is None:
+                data = await YTDLSource._resolve(head.url, loop=self.bot.loop, need_stream=True, priority=BACKGROUND)
+                # 해석하는 동안 대기열이 편집됐으면 첫 곡이 그대로인지 다시 확인
+                if self.queue.version != version and self.queue.peek() is not head:
+                    return
+                self._prefetched = (head, data)
+            await self._crossfade_when_due(head)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug(f"프리페치 실패 (재생 시 재시도): {e}")
+
+    async def _crossfade_when_due(self, head: Track) -> None:
+        """크로스페이드가 켜져 있으면 현재 곡 끝부분과 다음 곡 시작을 섞어서 전환"""
+        dm = getattr(self.bot, "data_manager", None)
+        seconds = dm.get_guild_crossfade(self.guild_id) if dm else 0
+        current = self.current
+        # Opus 직결 모드는 PCM을 다루지 않으므로 섞을 수 없음
+        if seconds <= 0 or self.loop_mode == "one" or not isinstance(current, YTDLSource) or not current.duration:
+            return
+        while True:
+            remaining = current.duration - self.elapsed()
+            if remaining <= seconds:
+                break
+            await asyncio.sleep(remaining - seconds)
+            if self.current is not current:
+                return
+        vc = self.voice_client
+        if not vc or not vc.is_playing():
+            return
+        incoming = await YTDLSource.prepare_player(
+            head, loop=self.bot.loop, volume=current.volume, data=self._take_prefetched(head), start=head.start
+        )
+        # 교체는 worker 차례에 (그 사이 곡이 바뀌었거나 대기열이 편집됐으면 일반 전환에 맡김)
+        try:
+            swapped = await self._call(self._handle_crossfade, current, head, incoming, seconds)
+        except BaseException:
+            # 취소되면 요청은 처리되지 않고 버려지므로 준비한 소스도 정리
+            incoming.cleanup()
+            raise
+        if not swapped:
+            incoming.cleanup()
+
+    async def _handle_crossfade(self, current: YTDLSource, head: Track, incoming: YTDLSource, seconds: float) -> bool:
+        vc = self.voice_client
+        if self.current is not current or not vc or not vc.is_playing() or self.queue.peek() is not head:
+            return False
+        self.queue.popleft()
+        if self.loop_mode == "all":
+            self.queue.append(head)
+        # 기존 after 콜백(play_id)은 그대로 두고 소스만 교체 -> 다음 곡이 끝나면 곡 종료 처리
+        vc.source = CrossfadeSource(vc.source, incoming, int(seconds / FRAME_SECONDS))
+        # 호출한 프리페치 Task는 곧 끝나므로 취소되지 않도록 등록만 지우고 공통 처리
+        # (invalidate_prefetch가 새 첫 곡 프리페치를 예약)
+        self._prefetch_task = None
+        self._track_started(head, incoming)
+        return True
+
+    # ----- 종료 -----
+
+    async def close(self) -> None:
+        """음성 연결 종료/봇 종료 시 정리 (처리 중인 요청이 끝나면 worker 종료)"""
+        if self._closed:
+            return
+        self._reset()
+        self._closed = True
+        if self._worker and not self._worker.done():
+            self._inbox.put_nowait(None)
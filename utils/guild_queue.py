@@ -0,0 +1,130 @@
+"""서버별 재생 대기열"""
+from __future__ import annotations
+import itertools
+import random
+from collections import deque
+from typing import Iterable, Iterator, List, Optional, Union
+
+from .constants import MAX_QUEUE_SIZE
+from .track import Track
+
+__all__ = ["QueueFullError", "GuildQueue"]
+
+
+class QueueFullError(ValueError):
+    """대기열 용량 초과 (ValueError이므로 명령어에서 그대로 사용자에게 표시됨)"""
+
+    def __init__(self, capacity: int) -> None:
+        super().__init__(f"대기열이 가득 찼습니다 (최대 {capacity}곡)")
+        self.capacity = capacity
+
+
+class GuildQueue:
+    """deque 기반 대기열 (첫 곡 꺼내기 O(1), 용량 제한, 변경 버전)
+
+    대기열이 바뀔 때마다 version이 증가하므로 프리페치처럼 나중에 결과를
+    쓰는 쪽은 시작 시점의 version과 비교해 편집 여부를 알 수 있다.
+    """
+
+    def __init__(self, items: Iterable[Track] = (), capacity: int = MAX_QUEUE_SIZE) -> None:
+        self.capacity = capacity
+        self._items: deque = deque()
+        self.version = 0
+        self.extend(items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __iter__(self) -> Iterator[Track]:
+        return iter(self._items)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Track, List[Track]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._items))
+            return list(itertools.islice(self._items, start, stop, step))
+        return self._items[index]
+
+    def __repr__(self) -> str:
+        return f"<GuildQueue {len(self._items)}/{self.capacity} v{self.version}>"
+
+    @property
+    def room(self) -> int:
+        """추가할 수 있는 남은 곡 수"""
+        return max(0, self.capacity - len(self._items))
+
+    def _changed(self) -> None:
+        self.version += 1
+
+    def peek(self) -> Optional[Track]:
+        """첫 곡 (비어 있으면 None)"""
+        return self._items[0] if self._items else None
+
+    def append(self, item: Track) -> None:
+        if len(self._items) >= self.capacity:
+            raise QueueFullError(self.capacity)
+        self._items.append(item)
+        self._changed()
+
+    def extend(self, items: Iterable[Track]) -> None:
+        """전부 들어갈 수 있을 때만 추가 (일부만 추가되지 않음)"""
+        items = list(items)
+        if not items:
+            return
+        if len(items) > self.room:
+            raise QueueFullError(self.capacity)
+        self._items.extend(items)
+        self._changed()
+
+    def appendleft(self, item: Track) -> None:
+        """맨 앞에 다시 넣음 (꺼냈다가 재생하지 못한 곡을 되돌릴 때)"""
+        if len(self._items) >= self.capacity:
+            raise QueueFullError(self.capacity)
+        self._items.appendleft(item)
+        self._changed()
+
+    def popleft(self) -> Track:
+        item = self._items.popleft()
+        self._changed()
+        return item
+
+    def pop(self, index: int = -1) -> Track:
+        """index 위치의 곡을 꺼냄 (양 끝은 O(1))"""
+        if index == 0:
+            return self.popleft()
+        item = self._items[index]
+        del self._items[index]
+        self._changed()
+        return item
+
+    def move(self, src: int, dst: int) -> Track:
+        """src 위치의 곡을 dst 위치로 옮김 (0부터 시작)"""
+        item = self._items[src]
+        del self._items[src]
+        self._items.insert(dst, item)
+        self._changed()
+        return item
+
+    def shuffle(self) -> None:
+        items = list(self._items)
+        random.shuffle(items)
+        self._items = deque(items)
+        self._changed()
+
+    def replace(self, items: Iterable[Track]) -> None:
+        """대기열 전체 교체 (용량 초과면 기존 대기열 유지)"""
+        items = list(items)
+        if len(items) > self.capacity:
+            raise QueueFullError(self.capacity)
+        self._items = deque(items)
+        self._changed()
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._changed()
+
+    def snapshot(self) -> List[Track]:
+        """저장/표시용 리스트 복사본"""
+        return list(self._items)
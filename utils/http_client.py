@@ -0,0 +1,94 @@
+"""봇 수명 동안 유지되는 공유 HTTP 클라이언트"""
+from __future__ import annotations
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+from .constants import HTTP_CONCURRENCY, HTTP_POOL_SIZE, HTTP_TIMEOUT
+
+__all__ = ["HTTPClient", "http_client"]
+
+logger = logging.getLogger(__name__)
+
+_USER_AGENT = "SickSickMusicBot"
+
+
+class HTTPClient:
+    """keep-alive 연결 풀을 공유하는 aiohttp 세션 래퍼
+
+    MusicBot이 초기화 때 open(), 종료 때 close()를 호출한다. 요청마다 제한
+    시간을 두고, 동시에 진행되는 요청 수는 HTTP_CONCURRENCY개로 제한한다.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_size: int = HTTP_POOL_SIZE,
+        concurrency: int = HTTP_CONCURRENCY,
+        timeout: float = HTTP_TIMEOUT,
+    ) -> None:
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._concurrency = concurrency
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._session is None or self._session.closed
+
+    async def open(self) -> None:
+        if not self.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_size,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": _USER_AGENT},
+        )
+        self._semaphore = asyncio.Semaphore(self._concurrency)
+
+    async def close(self) -> None:
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    async def get_json(
+        self,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, Any]:
+        """GET 요청 후 (상태 코드, JSON 본문) 반환 (200이 아니면 본문은 None)
+
+        연결/시간 초과 오류는 그대로 올라가므로 호출하는 쪽에서 처리한다.
+        """
+        if self.closed:
+            # 초기화 전에 호출된 경우 (정상 흐름에서는 MusicBot이 미리 열어 둠)
+            await self.open()
+        request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout is not None else None
+        async with self._semaphore:
+            self.requests += 1
+            try:
+                async with self._session.get(url, params=params, timeout=request_timeout) as resp:
+                    if resp.status != 200:
+                        return resp.status, None
+                    return resp.status, await resp.json(content_type=None)
+            except Exception:
+                self.failures += 1
+                raise
+
+    def stats(self) -> Dict[str, int]:
+        return {"requests": self.requests, "failures": self.failures}
+
+
+http_client = HTTPClient()
@@ -0,0 +1,201 @@
+"""파싱된 싱크 가사 2단 캐시 (메모리 LRU + 디스크)"""
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .constants import DATA_DIR, LYRICS_CACHE_MAX_FILES, LYRICS_CACHE_TTL, LYRICS_MISS_TTL
+from .resolve_cache import normalize_query
+
+__all__ = ["LyricsCache", "lyrics_cache"]
+
+logger = logging.getLogger(__name__)
+
+Timeline = List[Tuple[float, str]]
+
+_DURATION_BUCKET = 5  # 같은 곡의 업로드별 길이 차이를 흡수하는 반올림 단위(초)
+
+
+class LyricsCache:
+    """(정규화한 제목, 아티스트, 반올림한 길이) -> 파싱된 가사 타임라인
+
+    메모리에 최근 max_entries개를 두고, 디스크(root/<해시>.json)에 전부 저장해
+    재시작 후에도 재사용한다. 가사가 없다는 결과도 저장하되 더 짧은
+    miss_ttl 동안만 유지한다. 디스크 입출력은 스레드에서 처리한다.
+
+    디스크는 처음 사용할 때와 이후 max_files의 1/10만큼 저장할 때마다 정리한다.
+    만료된 파일을 지우고, 그래도 max_files개를 넘으면 오래 쓰지 않은 파일부터
+    지운다 (디스크에서 읽을 때 수정 시각을 갱신).
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        max_entries: int = 256,
+        ttl: float = LYRICS_CACHE_TTL,
+        miss_ttl: float = LYRICS_MISS_TTL,
+        max_files: int = LYRICS_CACHE_MAX_FILES,
+    ) -> None:
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.max_files = max_files
+        self._writes_until_sweep = 0  # 0이면 다음 사용 때 정리
+        self._sweeping = False
+        self._memory: "OrderedDict[str, Tuple[float, Optional[Timeline]]]" = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(title: str, artist: Optional[str] = None, duration: Optional[float] = None) -> str:
+        bucket = ""
+        if duration:
+            bucket = str(int(round(duration / _DURATION_BUCKET)) * _DURATION_BUCKET)
+        return "|".join((normalize_query(title), normalize_query(artist or ""), bucket))
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()[:24]}.json"
+
+    def _expired(self, stored_at: float, lyrics: Optional[Timeline]) -> bool:
+        return time.time() - stored_at > (self.ttl if lyrics else self.miss_ttl)
+
+    def _remember(self, key: str, stored_at: float, lyrics: Optional[Timeline]) -> None:
+        self._memory[key] = (stored_at, lyrics)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read(self, key: str) -> Optional[Tuple[float, Optional[Timeline]]]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"가사 캐시 파일 손상 ({path.name}): {e}")
+            path.unlink(missing_ok=True)
+            return None
+        if data.get("key") != key:
+            return None  # 해시 충돌
+        lyrics = data.get("lyrics")
+        if lyrics is not None:
+            lyrics = [(float(t), line) for t, line in lyrics]
+        try:
+            os.utime(path)  # 정리 시 최근 사용으로 취급
+        except OSError:
+            pass
+        return data.get("stored_at", 0.0), lyrics
+
+    def _write(self, key: str, stored_at: float, lyrics: Optional[Timeline]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "stored_at": stored_at, "lyrics": lyrics}, f, ensure_ascii=False)
+            tmp.replace(path)
+        except OSError as e:
+            logger.warning(f"가사 캐시 저장 실패 ({path.name}): {e}")
+
+    def _sweep(self) -> int:
+        """만료된 파일 삭제 후 max_files개를 넘는 오래된 파일 삭제 (지운 파일 수 반환)"""
+        if not self.root.is_dir():
+            return 0
+        now = time.time()
+        kept = []
+        removed = 0
+        for path in self.root.iterdir():
+            try:
+                if path.suffix == ".tmp":
+                    # 저장 도중 종료된 임시 파일
+                    if now - path.stat().st_mtime > 3600:
+                        path.unlink()
+                        removed += 1
+                    continue
+                if path.suffix != ".json":
+                    continue
+                mtime = path.stat().st_mtime
+                expired = now - mtime > self.ttl
+                if not expired and now - mtime > self.miss_ttl:
+                    # 가사 없음 항목은 더 짧게 유지하므로 내용 확인
+                    with open(path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    expired = self._expired(data.get("stored_at", 0.0), data.get("lyrics"))
+                if expired:
+                    path.unlink()
+                    removed += 1
+                else:
+                    kept.append((mtime, path))
+            except (OSError, ValueError) as e:
+                logger.debug(f"가사 캐시 정리 중 건너뜀 ({path.name}): {e}")
+        if len(kept) > self.max_files:
+            kept.sort()
+            for _, path in kept[:len(kept) - self.max_files]:
+                path.unlink(missing_ok=True)
+                removed += 1
+        if removed:
+            logger.info(f"가사 캐시 파일 {removed}개 정리")
+        return removed
+
+    def _maybe_sweep(self) -> None:
+        if self._sweeping or self._writes_until_sweep > 0:
+            return
+        self._sweeping = True
+        self._writes_until_sweep = max(1, self.max_files // 10)
+        loop = asyncio.get_event_loop()
+        future = loop.run_in_executor(None, self._sweep)
+
+        def done(f: asyncio.Future) -> None:
+            self._sweeping = False
+            if not f.cancelled() and f.exception() is not None:
+                logger.warning(f"가사 캐시 정리 실패: {f.exception()}")
+
+        future.add_done_callback(done)
+
+    async def get(self, title: str, artist: Optional[str] = None, duration: Optional[float] = None) -> Tuple[bool, Optional[Timeline]]:
+        """(캐시에 있음 여부, 가사) - 가사가 없다고 캐시된 곡은 (True, None)"""
+        self._maybe_sweep()
+        key = self.key_for(title, artist, duration)
+        entry = self._memory.get(key)
+        if entry is not None and not self._expired(*entry):
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return True, entry[1]
+        loop = asyncio.get_event_loop()
+        entry = await loop.run_in_executor(None, self._read, key)
+        if entry is not None and not self._expired(*entry):
+            self._remember(key, *entry)
+            self.disk_hits += 1
+            return True, entry[1]
+        self._memory.pop(key, None)
+        self.misses += 1
+        return False, None
+
+    async def put(self, title: str, artist: Optional[str], duration: Optional[float], lyrics: Optional[Timeline]) -> None:
+        key = self.key_for(title, artist, duration)
+        stored_at = time.time()
+        self._remember(key, stored_at, lyrics)
+        self._writes_until_sweep -= 1
+        self._maybe_sweep()
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self._write, key, stored_at, lyrics)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+
+lyrics_cache = LyricsCache(DATA_DIR / "lyrics_cache")
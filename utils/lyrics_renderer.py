@@ -0,0 +1,212 @@
+"""모든 서버의 싱크 가사 메시지 갱신을 처리하는 스케줄러"""
+from __future__ import annotations
+import asyncio
+import bisect
+import heapq
+import itertools
+import logging
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import discord
+
+from .constants import LYRICS_EDIT_BURST, LYRICS_EDIT_RATE
+from .embed_factory import embed_info
+
+__all__ = ["LyricsRenderer", "lyrics_renderer"]
+
+logger = logging.getLogger(__name__)
+
+Timeline = List[Tuple[float, str]]
+
+_MAX_SLEEP = 1.0  # 탐색으로 위치가 바뀌어도 1초 안에 따라가도록
+_MIN_SLEEP = 0.05
+
+
+class _TokenBucket:
+    """채널별 메시지 수정 한도 (초당 rate개, 최대 capacity개까지 모아 둠)"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: int, now: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """토큰을 쓰면 0, 부족하면 다음 토큰까지 남은 시간(초)"""
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+class _Session:
+    """가사 메시지 하나의 표시 상태"""
+
+    __slots__ = ("message", "channel_id", "times", "lines", "clock", "done", "seq", "first", "last", "editing")
+
+    def __init__(self, message: discord.Message, lyrics: Timeline, clock: Callable[[], float], done: asyncio.Future) -> None:
+        self.message = message
+        self.channel_id = getattr(message.channel, "id", None)
+        self.times = [t for t, _ in lyrics]
+        self.lines = [line for _, line in lyrics]
+        self.clock = clock
+        self.done = done
+        self.seq = 0  # 다시 예약할 때마다 증가, 힙에 남은 이전 예약을 걸러냄
+        self.first = -1  # 화면에 보이는 가사 줄 범위
+        self.last = -1
+        self.editing = False
+
+    @property
+    def finished(self) -> bool:
+        return self.done.done()
+
+
+class LyricsRenderer:
+    """하나의 타이머 힙으로 모든 서버의 가사 메시지를 갱신
+
+    각 가사 메시지는 다음 줄이 나올 시각에 깨어나 재생 시계를 다시 읽고,
+    채널별 토큰 버킷이 허락할 때만 수정한다. 한도에 걸리면 수정을 쌓아 두지
+    않고 토큰이 찰 때 그 시점의 위치로 다시 그리므로 지난 줄은 버려진다.
+    한 번의 수정에는 window초 안에 나올 줄을 묶어 현재 줄과 다음 줄을 함께
+    보여준다. 메시지 수정은 Task로 띄워 한 채널이 느려도 다른 서버를 막지 않는다.
+    """
+
+    def __init__(self, rate: float = LYRICS_EDIT_RATE, burst: int = LYRICS_EDIT_BURST) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.window = 1 / rate
+        self._heap: List[Tuple[float, int, int, _Session]] = []
+        self._order = itertools.count()  # 같은 시각 항목의 비교용
+        self._sessions: Set[_Session] = set()
+        self._buckets: Dict[Optional[int], _TokenBucket] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.edits = 0
+        self.dropped = 0
+
+    async def run(self, message: discord.Message, lyrics: Timeline, clock: Callable[[], float]) -> None:
+        """clock()(재생 위치, 초)에 맞춰 message를 갱신, 마지막 줄까지 표시하거나 취소되면 반환"""
+        loop = asyncio.get_event_loop()
+        session = _Session(message, lyrics, clock, loop.create_future())
+        if not session.times:
+            return
+        self._sessions.add(session)
+        self._schedule(session, loop.time())
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        try:
+            await session.done
+        finally:
+            self._finish(session)
+
+    def _schedule(self, session: _Session, due: float) -> None:
+        session.seq += 1
+        heapq.heappush(self._heap, (due, next(self._order), session.seq, session))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _finish(self, session: _Session) -> None:
+        if not session.done.done():
+            session.done.set_result(None)
+        self._sessions.discard(session)
+        # 다 찬 채 쓰이지 않는 버킷 정리
+        now = asyncio.get_event_loop().time()
+        active = {s.channel_id for s in self._sessions}
+        for channel_id in [c for c, b in self._buckets.items() if c not in active and b.full(now)]:
+            del self._buckets[channel_id]
+        if not self._sessions and self._wakeup is not None:
+            self._wakeup.set()  # 스케줄러 Task 종료
+
+    async def _run(self) -> None:
+        loop = asyncio.get_event_loop()
+        self._wakeup = asyncio.Event()
+        try:
+            while self._sessions:
+                now = loop.time()
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, seq, session = heapq.heappop(self._heap)
+                    if session.finished or seq != session.seq:
+                        continue
+                    try:
+                        self._render(session, now)
+                    except Exception as e:
+                        logger.error(f"가사 표시 오류: {e}")
+                        self._finish(session)
+                self._wakeup.clear()
+                timeout = self._heap[0][0] - loop.time() if self._heap else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._heap.clear()
+            self._wakeup = None
+
+    def _render(self, session: _Session, now: float) -> None:
+        if session.editing:
+            return  # 수정이 끝나면 다시 예약됨
+        times = session.times
+        position = session.clock()
+        index = bisect.bisect_right(times, position) - 1
+        if index < 0 or session.first <= index <= session.last:
+            # 새로 보여줄 줄이 없음 - 다음 줄 시각(최대 1초 뒤)에 다시 확인
+            upcoming = times[index + 1] if index + 1 < len(times) else None
+            if upcoming is None:
+                self._finish(session)
+                return
+            self._schedule(session, now + min(_MAX_SLEEP, max(_MIN_SLEEP, upcoming - position)))
+            return
+        bucket = self._buckets.get(session.channel_id)
+        if bucket is None:
+            bucket = self._buckets[session.channel_id] = _TokenBucket(self.rate, self.burst, now)
+        wait = bucket.take(now)
+        if wait > 0:
+            # 수정을 쌓아 두지 않고 토큰이 찰 때 그 시점 위치로 다시 그림
+            self._schedule(session, now + wait)
+            return
+        # 다음 수정 전에 나올 줄까지 한 번에 표시
+        last = max(index, bisect.bisect_right(times, position + self.window) - 1)
+        if session.last >= 0 and index > session.last + 1:
+            self.dropped += index - session.last - 1
+        session.first, session.last = index, last
+        text = "\n".join(f"**{line}**" for line in session.lines[index:last + 1])
+        if last + 1 < len(session.lines):
+            text += f"\n\n{session.lines[last + 1]}"
+        session.editing = True
+        asyncio.create_task(self._edit(session, embed_info(text)))
+
+    async def _edit(self, session: _Session, embed: discord.Embed) -> None:
+        try:
+            await session.message.edit(embed=embed)
+            self.edits += 1
+        except discord.NotFound:
+            logger.debug("가사 메시지가 삭제됨")
+            self._finish(session)
+        except Exception as e:
+            logger.warning(f"가사 업데이트 오류: {e}")
+            self._finish(session)
+        finally:
+            session.editing = False
+        if session.finished:
+            return
+        if session.last + 1 >= len(session.times):
+            self._finish(session)
+            return
+        self._schedule(session, asyncio.get_event_loop().time())
+
+    def stats(self) -> Dict[str, int]:
+        return {"sessions": len(self._sessions), "edits": self.edits, "dropped": self.dropped}
+
+
+lyrics_renderer = LyricsRenderer()
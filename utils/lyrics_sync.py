@@ -1,13 +1,22 @@
 from __future__ import annotations
+import asyncio
 import re
 import logging
+from difflib import SequenceMatcher
 from typing import Optional, List, Tuple
-import aiohttp
+
+from .circuit_breaker import lyrics_breaker
+from .constants import LYRICS_DURATION_TOLERANCE, LYRICS_TIMEOUT
+from .http_client import http_client
+from .lyrics_cache import lyrics_cache
+from .resolve_cache import normalize_query
 
 __all__ = ["parse_lrc", "fetch_lrc"]
 
 logger = logging.getLogger(__name__)
 
+LRCLIB_GET = "https://lrclib.net/api/get"
+LRCLIB_SEARCH = "https://lrclib.net/api/search"
 LRC_TIMESTAMP = re.compile(r"\[(\d+):(\d+)(?:\.(\d+))?\]")
 
 
@@ -34,30 +43,120 @@ def parse_lrc(lrc_text: str) -> List[Tuple[float, str]]:
     return lyrics
 
 
-async def fetch_lrc(song_title: str, artist: Optional[str] = None) -> Optional[List[Tuple[float, str]]]:
+def _title_similarity(query: str, name: str) -> float:
+    """0~1 (YouTube 제목처럼 곡명을 포함한 긴 제목이면 높게 봄)"""
+    query, name = normalize_query(query), normalize_query(name)
+    if not query or not name:
+        return 0.0
+    ratio = SequenceMatcher(None, query, name).ratio()
+    if name in query or query in name:
+        ratio = max(ratio, 0.8)
+    return ratio
+
+
+def _rank_candidates(results: List[dict], song_title: str, duration: Optional[float]) -> List[dict]:
+    """싱크 가사가 있는 검색 결과를 길이 차이와 제목 유사도 순으로 정렬
+    
+    곡 길이를 알면 LYRICS_DURATION_TOLERANCE초보다 많이 다른 결과는 버린다.
+    """
+    scored = []
+    for candidate in results:
+        if not candidate.get("syncedLyrics"):
+            continue
+        score = _title_similarity(song_title, candidate.get("trackName") or candidate.get("name") or "")
+        other = candidate.get("duration")
+        if duration and other:
+            diff = abs(float(other) - duration)
+            if diff > LYRICS_DURATION_TOLERANCE:
+                continue
+            score += 1.0 - diff / LYRICS_DURATION_TOLERANCE
+        scored.append((score, candidate))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [candidate for _, candidate in scored]
+
+
+async def _request(url: str, params: dict):
+    """lrclib 요청 하나 (연결 오류/5xx는 브레이커에 실패로 기록하고 예외)"""
     try:
-        async with aiohttp.ClientSession() as session:
-            params = {"track_name": song_title}
-            if artist:
-                params["artist_name"] = artist
-            
-            async with session.get("https://lrclib.net/api/get", params=params) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    synced_lyrics = data.get("syncedLyrics")
-                    if synced_lyrics:
-                        return parse_lrc(synced_lyrics)
-            
-            async with session.get("https://lrclib.net/api/search", params=params) as resp:
-                if resp.status == 200:
-                    results = await resp.json()
-                    if results and len(results) > 0:
-                        first_result = results[0]
-                        synced_lyrics = first_result.get("syncedLyrics")
-                        if synced_lyrics:
-                            return parse_lrc(synced_lyrics)
+        status, data = await http_client.get_json(url, params=params, timeout=LYRICS_TIMEOUT)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        lyrics_breaker.record_failure()
+        raise
+    if status >= 500 or status == 429:
+        lyrics_breaker.record_failure()
+        raise ConnectionError(f"lrclib 응답 {status}")
+    lyrics_breaker.record_success()
+    return status, data
+
+
+async def _lrclib_get(song_title: str, artist: Optional[str], duration: Optional[float]) -> Optional[List[Tuple[float, str]]]:
+    params = {"track_name": song_title}
+    if artist:
+        params["artist_name"] = artist
+    if duration:
+        params["duration"] = int(round(duration))
+    status, data = await _request(LRCLIB_GET, params)
+    if status == 200 and data and data.get("syncedLyrics"):
+        return parse_lrc(data["syncedLyrics"])
+    return None
+
+
+async def _lrclib_search(song_title: str, artist: Optional[str], duration: Optional[float]) -> Optional[List[Tuple[float, str]]]:
+    params = {"track_name": song_title}
+    if artist:
+        params["artist_name"] = artist
+    status, results = await _request(LRCLIB_SEARCH, params)
+    if status != 200 or not isinstance(results, list):
+        return None
+    for candidate in _rank_candidates(results, song_title, duration):
+        lyrics = parse_lrc(candidate["syncedLyrics"])
+        if lyrics:
+            return lyrics
+    return None
+
+
+async def _fetch_lrclib(song_title: str, artist: Optional[str] = None, duration: Optional[float] = None) -> Optional[List[Tuple[float, str]]]:
+    """lrclib에서 싱크 가사 조회 (없으면 None)
     
+    /api/get과 /api/search를 동시에 보내 먼저 가사를 돌려준 쪽을 쓰고 나머지는
+    취소한다. 가사를 못 찾았는데 한쪽이라도 오류였으면 그 오류를 올려 보낸다.
+    """
+    pending = {
+        asyncio.ensure_future(_lrclib_get(song_title, artist, duration)),
+        asyncio.ensure_future(_lrclib_search(song_title, artist, duration)),
+    }
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+                elif task.result():
+                    return task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+    if error is not None:
+        raise error
+    return None
+
+
+async def fetch_lrc(song_title: str, artist: Optional[str] = None, duration: Optional[float] = None) -> Optional[List[Tuple[float, str]]]:
+    """싱크 가사 조회 (캐시 우선, 가사가 없다는 결과도 캐시)"""
+    found, lyrics = await lyrics_cache.get(song_title, artist, duration)
+    if found:
+        return lyrics
+    if not lyrics_breaker.allow():
+        # lrclib 장애 중에는 기다리지 않고 가사 없이 진행 (캐시하지 않음)
+        return None
+    try:
+        lyrics = await _fetch_lrclib(song_title, artist, duration)
     except Exception as e:
+        # 일시적인 오류는 캐시하지 않음
         logger.error(f"가사 가져오기 실패: {e}")
-    
-    return None
+        return None
+    await lyrics_cache.put(song_title, artist, duration, lyrics)
+    return lyrics
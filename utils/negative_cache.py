@@ -0,0 +1,97 @@
+"""재생할 수 없는 곡(비공개/삭제/멤버십 전용/차단) 실패 캐시"""
+from __future__ import annotations
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional
+
+from .constants import NEGATIVE_CACHE_TTL
+from .resolve_cache import extract_video_id, normalize_query
+
+__all__ = ["NegativeEntry", "NegativeCache", "negative_cache"]
+
+logger = logging.getLogger(__name__)
+
+_BARE_VIDEO_ID = re.compile(r"[A-Za-z0-9_-]{11}")
+
+
+class NegativeEntry(NamedTuple):
+    key: str
+    reason: str
+    message: str
+    stored_at: float
+    hits: int
+
+
+class NegativeCache:
+    """비디오 ID(없으면 정규화한 검색어) -> 분류된 실패 사유 캐시
+
+    yt-dlp는 재시도 옵션 때문에 죽은 링크 하나에도 오래 걸리므로, 곡 자체의
+    문제로 분류된 실패는 TTL 동안 추출 없이 같은 오류로 바로 거절한다.
+    네트워크 오류 등 일시적인 실패는 저장하지 않는다.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = NEGATIVE_CACHE_TTL) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, NegativeEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key_for(query: str) -> str:
+        """URL이면 비디오 ID, 아니면 정규화한 검색어 (ID만 입력해도 같은 키)"""
+        query = query.strip()
+        if _BARE_VIDEO_ID.fullmatch(query):
+            return query
+        return extract_video_id(query) or normalize_query(query)
+
+    def get(self, query: str) -> Optional[NegativeEntry]:
+        key = self.key_for(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry.stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            entry = entry._replace(hits=entry.hits + 1)
+            self._entries[key] = entry
+            self.hits += 1
+            return entry
+
+    def put(self, query: str, reason: str, message: str) -> None:
+        key = self.key_for(query)
+        with self._lock:
+            self._entries[key] = NegativeEntry(key, reason, message, time.time(), 0)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        logger.info(f"재생 불가 곡 캐시 추가 ({key}: {reason})")
+
+    def remove(self, query: str) -> bool:
+        with self._lock:
+            return self._entries.pop(self.key_for(query), None) is not None
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+
+    def entries(self) -> List[NegativeEntry]:
+        """만료되지 않은 항목 (최근 추가 순)"""
+        now = time.time()
+        with self._lock:
+            return [e for e in reversed(self._entries.values()) if now - e.stored_at <= self.ttl]
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits}
+
+
+negative_cache = NegativeCache()
@@ -0,0 +1,164 @@
+"""yt-dlp 메타데이터 해석 결과 캐시"""
+from __future__ import annotations
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set
+from urllib.parse import parse_qs, urlparse
+
+__all__ = [
+    "ResolutionCache",
+    "resolution_cache",
+    "extract_video_id",
+    "normalize_query",
+]
+
+_VIDEO_ID_PATTERNS = (
+    re.compile(r"(?:youtube\.com/(?:watch\?(?:.*&)?v=|shorts/|embed/|live/)|youtu\.be/)([A-Za-z0-9_-]{11})"),
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def extract_video_id(url: str | None) -> Optional[str]:
+    """YouTube URL에서 비디오 ID 추출 (URL이 아니면 None)"""
+    if not url:
+        return None
+    for pattern in _VIDEO_ID_PATTERNS:
+        m = pattern.search(url)
+        if m:
+            return m.group(1)
+    return None
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 검색어 정규화 (URL은 대소문자 유지)"""
+    query = _WHITESPACE.sub(" ", query.strip())
+    if query.startswith("http"):
+        return query
+    return query.lower()
+
+
+def _stream_expires_at(stream_url: str | None) -> Optional[float]:
+    """googlevideo 스트림 URL의 expire 파라미터 (unix time)"""
+    if not stream_url:
+        return None
+    try:
+        values = parse_qs(urlparse(stream_url).query).get("expire")
+        if values:
+            return float(values[0])
+    except ValueError:
+        pass
+    return None
+
+
+class ResolutionCache:
+    """TTL + LRU 방식의 프로세스 전역 해석 캐시
+
+    검색어와 비디오 ID 두 가지 키로 같은 info 딕셔너리를 가리킨다. 항목이
+    만료/폐기/LRU 삭제되면 그 항목을 가리키던 검색어 별칭도 함께 지운다.
+    메타데이터는 TTL 동안 재사용하고, 스트림 URL은 expire 파라미터가
+    곡 길이 + 여유 시간보다 넉넉히 남아 있을 때만 재사용한다.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 6 * 3600, stream_margin: float = 60.0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stream_margin = stream_margin
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._queries: Dict[str, str] = {}  # 정규화한 검색어 -> 비디오 ID
+        self._aliases: Dict[str, Set[str]] = {}  # 비디오 ID -> 검색어 (역색인)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key_for(self, query: str) -> Optional[str]:
+        video_id = extract_video_id(query)
+        if video_id:
+            return video_id
+        return self._queries.get(normalize_query(query))
+
+    def _drop(self, key: str) -> None:
+        """항목과 그 항목을 가리키는 별칭 삭제 (lock 안에서 호출)"""
+        self._entries.pop(key, None)
+        for query in self._aliases.pop(key, ()):
+            if self._queries.get(query) == key:
+                del self._queries[query]
+
+    def _lookup(self, query: str) -> Optional[Dict[str, Any]]:
+        key = self._key_for(query)
+        if key is None:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self._drop(key)
+            return None
+        stored_at, info = entry
+        if time.time() - stored_at > self.ttl:
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return info
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        """검색어/URL에 해당하는 info (메타데이터 용도)"""
+        with self._lock:
+            info = self._lookup(query)
+            if info is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return info
+
+    def get_stream(self, query: str) -> Optional[Dict[str, Any]]:
+        """스트림 URL이 아직 유효한 info만 반환"""
+        with self._lock:
+            info = self._lookup(query)
+            if info is None or not self.stream_valid(info):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return info
+
+    def stream_valid(self, info: Dict[str, Any]) -> bool:
+        expires_at = _stream_expires_at(info.get("url"))
+        if expires_at is None:
+            return False
+        needed = (info.get("duration") or 0) + self.stream_margin
+        return expires_at - time.time() > needed
+
+    def put(self, info: Dict[str, Any], query: Optional[str] = None) -> None:
+        """info 저장 (비디오 ID 기준, 검색어는 별칭으로 연결)"""
+        video_id = info.get("id") or extract_video_id(info.get("webpage_url"))
+        if not video_id:
+            return
+        with self._lock:
+            self._entries[video_id] = (time.time(), info)
+            self._entries.move_to_end(video_id)
+            if query:
+                alias = normalize_query(query)
+                previous = self._queries.get(alias)
+                if previous is not None and previous != video_id:
+                    self._aliases.get(previous, set()).discard(alias)
+                self._queries[alias] = video_id
+                self._aliases.setdefault(video_id, set()).add(alias)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, query: str) -> None:
+        with self._lock:
+            key = self._key_for(query)
+            if key is not None:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._queries.clear()
+            self._aliases.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+resolution_cache = ResolutionCache()
@@ -0,0 +1,118 @@
+"""검색어별 YouTube 평면 검색 결과 캐시"""
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .constants import SEARCH_CACHE_TTL, SEARCH_MAX_RESULTS, SEARCH_PAGE_SIZE
+from .resolve_cache import normalize_query
+from .sources import YTDLSource
+from .track import Track
+
+__all__ = ["SearchCache", "search_cache"]
+
+logger = logging.getLogger(__name__)
+
+
+class _Results:
+    __slots__ = ("fetched_at", "tracks", "requested")
+
+    def __init__(self, tracks: List[Track], requested: int) -> None:
+        self.fetched_at = time.time()
+        self.tracks = tracks
+        self.requested = requested
+
+    @property
+    def exhausted(self) -> bool:
+        """요청한 만큼 결과가 오지 않았으면 더 조회해도 없음"""
+        return len(self.tracks) < self.requested or self.requested >= SEARCH_MAX_RESULTS
+
+
+class SearchCache:
+    """정규화한 검색어 -> 평면 검색 결과 (짧은 TTL + LRU)
+
+    처음에는 두 페이지 분량을 조회하고, 그 뒤 페이지가 필요해지면 조회 개수를
+    늘려 다시 가져온다. 같은 검색어를 동시에 조회하면 한 번만 추출한다.
+    """
+
+    def __init__(self, ttl: float = SEARCH_CACHE_TTL, max_entries: int = 256) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Results]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, key: str) -> Optional[_Results]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry.fetched_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def peek(self, query: str) -> Optional[List[Track]]:
+        """조회 없이 캐시된 결과만 (없거나 만료됐으면 None)"""
+        entry = self._cached(normalize_query(query))
+        return entry.tracks if entry else None
+
+    async def _fetch(self, key: str, query: str, count: int, background: bool) -> _Results:
+        inflight = self._inflight.get((key, count))
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        fut = asyncio.get_event_loop().create_future()
+        self._inflight[(key, count)] = fut
+        try:
+            tracks = await YTDLSource.search(query, count=count, background=background)
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()  # 기다리는 쪽이 없어도 경고가 남지 않도록
+            raise
+        finally:
+            self._inflight.pop((key, count), None)
+        entry = _Results(tracks, count)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        fut.set_result(entry)
+        return entry
+
+    async def page(
+        self,
+        query: str,
+        page: int = 0,
+        *,
+        page_size: int = SEARCH_PAGE_SIZE,
+        background: bool = False,
+    ) -> Tuple[List[Track], bool]:
+        """page번째(0부터) 결과와 다음 페이지가 있을 수 있는지 여부
+
+        background: 자동완성 조회 (YTDLSource.search 참고)
+        """
+        key = normalize_query(query)
+        needed = (page + 1) * page_size
+        entry = self._cached(key)
+        if entry is not None and (len(entry.tracks) >= needed or entry.exhausted):
+            self.hits += 1
+        else:
+            self.misses += 1
+            count = max(needed, page_size * 2, (entry.requested * 2) if entry else 0)
+            entry = await self._fetch(key, query, min(count, SEARCH_MAX_RESULTS), background)
+        start = page * page_size
+        tracks = entry.tracks[start:start + page_size]
+        has_more = len(entry.tracks) > start + page_size or not entry.exhausted
+        return tracks, has_more
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+search_cache = SearchCache()
@@ -0,0 +1,454 @@
+"""yt-dlp 기반 재생 소스와 스트림 해석"""
+from __future__ import annotations
+import logging
+import re
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import discord
+import yt_dlp
+
+from .audio import FRAME_SECONDS, NumpyVolumeTransformer
+from .audio_cache import audio_cache
+from .circuit_breaker import CircuitOpenError, extraction_breaker
+from .constants import MAX_QUEUE_SIZE
+from .extraction_executor import BACKGROUND, INTERACTIVE, download_executor, extraction_executor
+from .negative_cache import negative_cache
+from .resolve_cache import resolution_cache
+from .track import Track, track_catalog
+from .ytdl_pool import ytdl_pool
+
+__all__ = [
+    "YTDL_OPTIONS",
+    "FFMPEG_OPTIONS",
+    "is_playlist_url",
+    "parse_timestamp",
+    "parse_start_offset",
+    "classify_download_error",
+    "YTDLOpusSource",
+    "YTDLSource",
+]
+
+logger = logging.getLogger(__name__)
+
+YTDL_OPTIONS = {
+    "format": "bestaudio/best",
+    "extractaudio": True,
+    "audioformat": "mp3",
+    "outtmpl": "%(extractor)s-%(id)s-%(title)s.%(ext)s",
+    "restrictfilenames": True,
+    "noplaylist": True,
+    "nocheckcertificate": True,
+    "ignoreerrors": False,
+    "logtostderr": False,
+    "quiet": True,
+    "no_warnings": True,
+    "default_search": "auto",
+    "source_address": "0.0.0.0",
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+    "referer": "https://www.youtube.com/",
+    "socket_timeout": 30,
+    "retries": 10,
+    "fragment_retries": 10,
+    "extractor_retries": 3,
+    "file_access_retries": 3,
+    "http_chunk_size": 10485760,  # 10MB
+}
+ytdl_pool.register("stream", YTDL_OPTIONS)
+
+# 플레이리스트는 제목/ID만 평면 추출하고 포맷 해석은 재생(프리페치) 시점으로 미룸
+PLAYLIST_OPTIONS = {
+    **YTDL_OPTIONS,
+    "noplaylist": False,
+    "extract_flat": "in_playlist",
+    "playlistend": MAX_QUEUE_SIZE,
+}
+ytdl_pool.register("playlist", PLAYLIST_OPTIONS)
+
+# 검색 목록도 제목/길이/URL만 평면 추출 (선택한 곡만 재생 시점에 해석)
+SEARCH_OPTIONS = {
+    "quiet": True,
+    "no_warnings": True,
+    "extract_flat": "in_playlist",
+    "skip_download": True,
+    "source_address": "0.0.0.0",
+}
+ytdl_pool.register("search", SEARCH_OPTIONS)
+
+_UNAVAILABLE_TITLES = {"[Private video]", "[Deleted video]"}
+
+
+def _flat_entry_track(entry):
+    """평면 추출 항목 -> Track (재생할 수 없는 항목이면 None)"""
+    if not entry or not entry.get("id") or entry.get("title") in _UNAVAILABLE_TITLES:
+        return None
+    thumbnails = entry.get("thumbnails") or []
+    return track_catalog.intern(Track(
+        f"https://www.youtube.com/watch?v={entry['id']}",
+        title=entry.get("title"),
+        duration=entry.get("duration"),
+        thumbnail=thumbnails[-1].get("url") if thumbnails else None,
+        uploader=entry.get("uploader") or entry.get("channel"),
+        view_count=entry.get("view_count"),
+        id=entry["id"],
+    ))
+
+# 곡 자체의 문제로 분류되는 yt-dlp 오류 (사유 키, 메시지 일부, 사용자 메시지)
+_VIDEO_ERRORS = (
+    ("private", "Private video", "비공개 비디오입니다. 접근할 수 없습니다."),
+    ("unavailable", "Video unavailable", "비디오를 사용할 수 없습니다."),
+    ("not_available", "This video is not available", "이 비디오는 사용할 수 없습니다."),
+    ("members_only", "members-only content", "멤버십 전용 콘텐츠입니다."),
+    ("blocked", "blocked", "이 비디오는 차단되었거나 지역 제한이 있습니다."),
+)
+
+
+def classify_download_error(error_msg: str):
+    """곡 자체의 문제면 (사유 키, 사용자 메시지), 네트워크/차단 등 일반 오류면 None"""
+    lowered = error_msg.lower()
+    for reason, needle, message in _VIDEO_ERRORS:
+        if needle.lower() in lowered:
+            return reason, message
+    return None
+
+
+def is_playlist_url(query: str) -> bool:
+    """재생목록 자체를 가리키는 YouTube URL인지 (watch?v=...&list=는 단일 곡으로 취급)"""
+    if not query.startswith("http"):
+        return False
+    parsed = urlparse(query)
+    if "youtube.com" not in parsed.netloc:
+        return False
+    return parsed.path.rstrip("/") == "/playlist" and "list" in parse_qs(parsed.query)
+
+
+_TIMESTAMP_UNITS = re.compile(r"(?:(\d+)h)?(?:(\d+)m)?(?:(\d+(?:\.\d+)?)s?)?")
+
+
+def parse_timestamp(text: str):
+    """"1:30", "01:02:03", "90", "1m30s" 형식을 초로 변환 (형식이 틀리면 None)"""
+    text = text.strip().lower()
+    if not text:
+        return None
+    if ":" in text:
+        parts = text.split(":")
+        if len(parts) > 3 or not all(p.isdigit() for p in parts):
+            return None
+        seconds = 0.0
+        for part in parts:
+            seconds = seconds * 60 + int(part)
+        return seconds
+    m = _TIMESTAMP_UNITS.fullmatch(text)
+    if not m or not any(m.groups()):
+        return None
+    hours, minutes, seconds = m.groups()
+    return int(hours or 0) * 3600 + int(minutes or 0) * 60 + float(seconds or 0)
+
+
+def parse_start_offset(url: str) -> float:
+    """YouTube URL의 t= / start= 시작 위치(초), 없으면 0"""
+    if not url.startswith("http"):
+        return 0.0
+    parsed = urlparse(url)
+    params = parse_qs(parsed.query)
+    # youtu.be 공유 링크는 #t=로 붙는 경우도 있음
+    params.update((k, v) for k, v in parse_qs(parsed.fragment).items() if k not in params)
+    for name in ("t", "start"):
+        if name in params:
+            return parse_timestamp(params[name][0]) or 0.0
+    return 0.0
+
+
+FFMPEG_OPTIONS = {
+    "before_options": "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5 -loglevel error",
+    "options": "-vn -bufsize 2048k -sn"
+}
+
+# 로컬 캐시 파일은 재연결 옵션이 필요 없음
+FFMPEG_LOCAL_OPTIONS = {
+    "before_options": "-loglevel error",
+    "options": "-vn -sn"
+}
+
+AUDIO_CACHE_OPTIONS = {
+    **YTDL_OPTIONS,
+    "format": "bestaudio[ext=webm]/bestaudio",
+    "outtmpl": str(audio_cache.root / "%(id)s.%(ext)s"),
+}
+ytdl_pool.register("cache", AUDIO_CACHE_OPTIONS)
+
+
+def _fill_audio_cache(video_id, webpage_url) -> None:
+    """추출 워커(백그라운드 레인)에서 곡을 오디오 캐시에 다운로드"""
+    try:
+        with ytdl_pool.acquire("cache") as ydl:
+            info = ydl.extract_info(webpage_url, download=True)
+            path = Path(ydl.prepare_filename(info))
+    except Exception as e:
+        audio_cache.abandon(video_id)
+        logger.warning(f"오디오 캐시 저장 실패 ({video_id}): {e}")
+        return
+    audio_cache.store(video_id, path)
+
+
+class _TrackData:
+    """재생 소스 공통 메타데이터 + 재생 시계
+
+    재생 위치는 read()가 실제로 내보낸 20ms 프레임 수로 계산한다. 일시정지
+    중에는 read()가 호출되지 않으므로 시계도 멈추고, -ss로 시작한 소스는
+    start부터 센다.
+    """
+
+    def _load_data(self, data, start=0.0) -> None:
+        self.start = start
+        self.frames = 0
+        self.data = data
+        self.title = data.get("title")
+        self.url = data.get("url")
+        self.webpage_url = data.get("webpage_url", data.get("url"))
+        self.duration = data.get("duration")
+        self.thumbnail = data.get("thumbnail")
+        self.uploader = data.get("uploader")
+        self.view_count = data.get("view_count")
+        self.track = track_catalog.from_info(data)
+
+    @property
+    def position(self) -> float:
+        """실제로 전송된 프레임 기준 재생 위치(초)"""
+        return self.start + self.frames * FRAME_SECONDS
+
+    def read(self) -> bytes:
+        frame = super().read()
+        if frame:
+            self.frames += 1
+        return frame
+
+
+class YTDLOpusSource(_TrackData, discord.FFmpegOpusAudio):
+    """FFmpeg가 볼륨 필터와 Opus 인코딩을 모두 처리하는 소스
+
+    PCM 변환/파이썬 볼륨 처리/libopus 재인코딩을 건너뛰고 Opus 패킷을 그대로
+    전송한다. 볼륨 변경은 현재 위치에서 FFmpeg를 다시 시작해 반영한다.
+    """
+
+    def __init__(self, filename, *, data, volume=0.05, start=0.0, local=False) -> None:
+        self._load_data(data, start)
+        self.filename = filename
+        self.local = local
+        self._volume = volume
+        base = FFMPEG_LOCAL_OPTIONS if local else FFMPEG_OPTIONS
+        before_options = base["before_options"]
+        if start > 0:
+            before_options += f" -ss {start:.2f}"
+        # 볼륨 100%이고 원본이 Opus면 필터 없이 그대로 복사
+        if volume == 1.0 and data.get("acodec") == "opus":
+            codec, options = "opus", base["options"]
+        else:
+            codec, options = None, f'{base["options"]} -af volume={volume:.3f}'
+        super().__init__(filename, codec=codec, before_options=before_options, options=options)
+
+    @property
+    def volume(self) -> float:
+        return self._volume
+
+    def restarted(self, *, volume=None, filename=None, start=None) -> "YTDLOpusSource":
+        """현재 위치(또는 start)부터 다시 시작하는 새 소스 (filename: 새로 해석한 스트림 URL)"""
+        return YTDLOpusSource(
+            filename or self.filename,
+            data={**self.data, "url": filename} if filename else self.data,
+            volume=self._volume if volume is None else volume,
+            start=self.position if start is None else start,
+            local=self.local,
+        )
+
+
+class YTDLSource(_TrackData, NumpyVolumeTransformer):
+    """NumPy 볼륨 변환을 거치는 PCM 재생 소스 (yt-dlp 해석/캐시 포함)"""
+
+    def __init__(self, source, *, data, volume=0.05, start=0.0, local=False) -> None:
+        super().__init__(source, volume)
+        self._load_data(data, start)
+        self.local = local
+
+    def restarted(self, *, volume=None, filename=None, start=None) -> "YTDLSource":
+        """현재 위치(또는 start)부터 다시 시작하는 새 소스 (filename: 새로 해석한 스트림 URL)"""
+        return self._build(
+            filename or self.data["url"],
+            {**self.data, "url": filename} if filename else self.data,
+            self.volume if volume is None else volume,
+            local=self.local,
+            start=self.position if start is None else start,
+        )
+
+    @staticmethod
+    def _build(filename, data, volume, *, local=False, mode="pcm", start=0.0):
+        if mode == "opus":
+            return YTDLOpusSource(filename, data=data, volume=volume, start=start, local=local)
+        options = dict(FFMPEG_LOCAL_OPTIONS if local else FFMPEG_OPTIONS)
+        if start > 0:
+            options["before_options"] += f" -ss {start:.2f}"
+        return YTDLSource(discord.FFmpegPCMAudio(filename, **options), data=data, volume=volume, start=start, local=local)
+
+    @staticmethod
+    def _map_download_error(e: "yt_dlp.utils.DownloadError") -> ValueError:
+        error_msg = str(e)
+        classified = classify_download_error(error_msg)
+        if classified is not None:
+            return ValueError(classified[1])
+        return ValueError(f"비디오를 불러올 수 없습니다: {error_msg}")
+
+    @classmethod
+    async def _run_extraction(
+        cls, func, query, *, priority, remember_failure=False, record=True, executor=extraction_executor
+    ) -> dict:
+        """추출 브레이커를 거쳐 yt-dlp 호출 (연달아 실패하면 모든 서버의 추출을 잠시 중단)
+
+        remember_failure면 곡 자체 문제로 분류된 실패를 negative_cache에 저장한다.
+        record가 False면(자동완성 등 부가 조회) 브레이커가 막고 있을 때만 거절하고,
+        시험 호출 자리를 차지하거나 결과를 기록하지 않는다.
+        """
+        if not record:
+            if extraction_breaker.blocked:
+                raise CircuitOpenError(extraction_breaker.name, extraction_breaker.retry_after)
+            try:
+                return await executor.run(func, query, priority=priority)
+            except yt_dlp.utils.DownloadError as e:
+                raise cls._map_download_error(e)
+        extraction_breaker.check()
+        try:
+            data = await executor.run(func, query, priority=priority)
+        except yt_dlp.utils.DownloadError as e:
+            # 비공개/삭제 등 곡 자체 문제는 추출이 정상 동작한 것이므로 실패로 세지 않음
+            classified = classify_download_error(str(e))
+            if classified is None:
+                extraction_breaker.record_failure()
+            else:
+                extraction_breaker.record_success()
+                if remember_failure:
+                    negative_cache.put(query, *classified)
+            raise cls._map_download_error(e)
+        except ValueError:
+            # 작업 함수가 결과를 보고 거절함 (검색 결과 없음 등) - 추출 자체는 정상
+            extraction_breaker.record_success()
+            raise
+        except Exception:
+            extraction_breaker.record_failure()
+            raise
+        extraction_breaker.record_success()
+        return data
+
+    @classmethod
+    async def run_download(cls, func, query):
+        """func(query)로 파일 전체를 받는 작업 실행 (노래방 MR/원곡 다운로드)
+
+        재생 추출과 같은 브레이커와 실패 캐시를 거치지만, 오래 걸리므로
+        download_executor에서 실행해 재생 추출 워커를 차지하지 않는다.
+        """
+        failed = negative_cache.get(query)
+        if failed is not None:
+            raise ValueError(failed.message)
+        return await cls._run_extraction(
+            func, query, priority=INTERACTIVE, remember_failure=True, executor=download_executor
+        )
+
+    @staticmethod
+    def _extract(query) -> dict:
+        with ytdl_pool.acquire("stream") as ydl:
+            return ydl.extract_info(query, download=False)
+
+    @classmethod
+    async def _resolve(cls, query, *, loop=None, need_stream=False, priority=INTERACTIVE) -> dict:
+        """캐시를 거쳐 yt-dlp info 조회 (need_stream이면 유효한 스트림 URL 보장)"""
+        cached = resolution_cache.get_stream(query) if need_stream else resolution_cache.get(query)
+        if cached is not None:
+            return cached
+        # 최근 재생 불가로 확인된 곡은 추출 없이 같은 오류로 거절
+        failed = negative_cache.get(query)
+        if failed is not None:
+            raise ValueError(failed.message)
+        data = await cls._run_extraction(cls._extract, query, priority=priority, remember_failure=True)
+        if "entries" in data:
+            if not data["entries"]:
+                raise ValueError("검색 결과가 없습니다")
+            data = data["entries"][0]
+        resolution_cache.put(data, query=query)
+        return data
+
+    @staticmethod
+    def _extract_playlist(url) -> dict:
+        with ytdl_pool.acquire("playlist") as ydl:
+            return ydl.extract_info(url, download=False)
+
+    @classmethod
+    async def create_playlist_sources(cls, url, *, limit=MAX_QUEUE_SIZE) -> list:
+        """재생목록 URL을 한 번의 평면 추출로 소스 정보 목록으로 변환"""
+        data = await cls._run_extraction(cls._extract_playlist, url, priority=INTERACTIVE)
+        sources = []
+        for entry in data.get("entries") or []:
+            if len(sources) >= limit:
+                break
+            track = _flat_entry_track(entry)
+            if track is not None:
+                sources.append(track)
+        return sources
+
+    @staticmethod
+    def _extract_search(query) -> dict:
+        with ytdl_pool.acquire("search") as ydl:
+            return ydl.extract_info(query, download=False)
+
+    @classmethod
+    async def search(cls, query, *, count=10, background=False) -> list:
+        """YouTube 검색 상위 count개를 평면 추출 (포맷 해석은 선택한 곡을 재생할 때)
+
+        background면(자동완성) 낮은 우선순위로 실행하고 실패를 브레이커에 기록하지 않는다.
+        """
+        data = await cls._run_extraction(
+            cls._extract_search,
+            f"ytsearch{count}:{query}",
+            priority=BACKGROUND if background else INTERACTIVE,
+            record=not background,
+        )
+        tracks = (_flat_entry_track(entry) for entry in data.get("entries") or [])
+        return [track for track in tracks if track is not None]
+
+    @classmethod
+    async def from_url(cls, url, *, loop=None, stream=True) -> None:
+        data = await cls._resolve(url, loop=loop, need_stream=True)
+        filename = data["url"]
+        return cls(discord.FFmpegPCMAudio(filename, **FFMPEG_OPTIONS), data=data)
+
+    @classmethod
+    async def create_source(cls, search, *, loop=None) -> Track:
+        """검색어나 URL로부터 곡 정보만 추출 (스트림 URL은 나중에)"""
+        data = await cls._resolve(search, loop=loop)
+        return track_catalog.from_info(data)
+
+    @classmethod
+    async def prepare_player(cls, source_info: Track, *, loop=None, volume=0.05, data=None, mode="pcm", start=0.0) -> None:
+        """재생 직전에 스트림 URL을 확보해서 플레이어 생성 (프리페치/캐시가 유효하면 재사용)
+
+        start를 주면 그 위치(초)부터 재생한다.
+        """
+        video_id = source_info.id
+        cached_path = audio_cache.lookup(video_id)
+        if cached_path is not None:
+            data = source_info.to_dict()
+            data["url"] = str(cached_path)
+            return cls._build(str(cached_path), data, volume, local=True, mode=mode, start=start)
+        if data is None or not resolution_cache.stream_valid(data):
+            data = await cls._resolve(source_info.url, loop=loop, need_stream=True)
+        # source_info의 정보를 유지하면서 스트림 URL 사용 (캐시 원본은 건드리지 않음)
+        data = dict(data)
+        data.update((k, v) for k, v in source_info.to_dict().items() if v is not None)
+        filename = data["url"]
+        return cls._build(filename, data, volume, mode=mode, start=start)
+
+    @staticmethod
+    def record_play(source_info: Track) -> None:
+        """곡이 실제로 재생을 시작할 때 호출 (재연결/탐색/크로스페이드용 준비는 세지 않음)
+
+        자주 재생되는 곡은 백그라운드에서 로컬 캐시로 저장한다.
+        """
+        if audio_cache.record_play(source_info.id):
+            extraction_executor.submit(_fill_audio_cache, source_info.id, source_info.url, priority=BACKGROUND)
@@ -0,0 +1,126 @@
+"""곡 제목 자동완성 (재생 기록/저장된 플레이리스트 색인 + 캐시된 평면 검색)"""
+from __future__ import annotations
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+from .circuit_breaker import extraction_breaker
+from .constants import AUTOCOMPLETE_DEBOUNCE, AUTOCOMPLETE_TIMEOUT
+from .resolve_cache import normalize_query
+from .search_cache import search_cache
+
+__all__ = ["SuggestionIndex", "suggestion_index", "autocomplete_url", "autocomplete_title"]
+
+logger = logging.getLogger(__name__)
+
+_MAX_CHOICES = 25  # 디스코드 자동완성 최대 선택지 수
+_MIN_REMOTE_LENGTH = 2
+
+# (정규화한 제목, 제목, URL)
+_Entry = Tuple[str, str, str]
+
+
+class SuggestionIndex:
+    """서버별 재생 기록 + 플레이리스트 곡 색인
+
+    DataManager.suggestion_version이 바뀔 때만 다시 만들고, 조회는 메모리에서
+    문자열 비교만 하므로 이벤트 루프를 막지 않는다. 온라인 검색은 입력이
+    AUTOCOMPLETE_DEBOUNCE초 동안 멈췄을 때만 search_cache를 거쳐 실행하고,
+    제한 시간 안에 끝나지 않으면 로컬 결과만 돌려준다 (검색은 계속 진행되어
+    다음 입력 때 캐시에서 바로 나온다).
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[int, Tuple[int, List[_Entry]]] = {}
+        self._latest: Dict[int, int] = {}  # 사용자별 마지막 요청 번호 (디바운스)
+        self._seq = 0
+
+    def _guild_entries(self, bot: discord.Bot, guild_id: int) -> List[_Entry]:
+        dm = getattr(bot, "data_manager", None)
+        if dm is None:
+            return []
+        cached = self._entries.get(guild_id)
+        if cached and cached[0] == dm.suggestion_version:
+            return cached[1]
+        entries: List[_Entry] = []
+        seen = set()
+        # 최근 재생한 곡이 먼저, 그 다음 플레이리스트 곡
+        playlists = getattr(bot, "playlists", {}).get(str(guild_id), {})
+        items = list(dm.get_play_history(guild_id))
+        for playlist in playlists.values():
+            items.extend(playlist)
+        for item in items:
+            title, url = item.get("title"), item.get("webpage_url")
+            if not title or not url or url in seen:
+                continue
+            seen.add(url)
+            entries.append((normalize_query(title), title, url))
+        self._entries[guild_id] = (dm.suggestion_version, entries)
+        return entries
+
+    def local(self, bot: discord.Bot, guild_id: Optional[int], text: str) -> List[Tuple[str, str]]:
+        """입력과 일치하는 (제목, URL) 목록 (앞부분 일치가 먼저)"""
+        if guild_id is None:
+            return []
+        entries = self._guild_entries(bot, guild_id)
+        needle = normalize_query(text)
+        if not needle:
+            return [(title, url) for _, title, url in entries[:_MAX_CHOICES]]
+        prefix = [(title, url) for key, title, url in entries if key.startswith(needle)]
+        inner = [(title, url) for key, title, url in entries if needle in key and not key.startswith(needle)]
+        return (prefix + inner)[:_MAX_CHOICES]
+
+    async def remote(self, user_id: int, text: str) -> List[Tuple[str, str]]:
+        """디바운스된 평면 검색 결과 (생략됐거나 시간 초과면 빈 목록)"""
+        if len(text.strip()) < _MIN_REMOTE_LENGTH or text.startswith("http"):
+            return []
+        cached = search_cache.peek(text)
+        if cached is not None:
+            return [(t.title, t.url) for t in cached if t.title]
+        if extraction_breaker.blocked:
+            return []
+        self._seq += 1
+        seq = self._latest[user_id] = self._seq
+        await asyncio.sleep(AUTOCOMPLETE_DEBOUNCE)
+        if self._latest.get(user_id) != seq:
+            return []  # 더 새로운 입력이 들어옴 (이 응답은 화면에 쓰이지 않음)
+        self._latest.pop(user_id, None)
+        # 재생 추출보다 뒤로 밀리고, 실패해도 추출 브레이커에 영향을 주지 않음
+        fetch = asyncio.ensure_future(search_cache.page(text, background=True))
+        try:
+            tracks, _ = await asyncio.wait_for(asyncio.shield(fetch), AUTOCOMPLETE_TIMEOUT)
+        except asyncio.TimeoutError:
+            # 검색은 계속 진행되어 캐시에 남음
+            fetch.add_done_callback(lambda f: f.cancelled() or f.exception())
+            return []
+        except Exception as e:
+            logger.debug(f"자동완성 검색 실패: {e}")
+            return []
+        return [(t.title, t.url) for t in tracks if t.title]
+
+    async def suggest(self, ctx: discord.AutocompleteContext) -> List[Tuple[str, str]]:
+        text = ctx.value or ""
+        guild_id = ctx.interaction.guild_id
+        results = self.local(ctx.bot, guild_id, text)
+        if len(results) < _MAX_CHOICES:
+            seen = {url for _, url in results}
+            remote = await self.remote(ctx.interaction.user.id, text)
+            results.extend((title, url) for title, url in remote if url not in seen)
+        return results[:_MAX_CHOICES]
+
+
+suggestion_index = SuggestionIndex()
+
+
+async def autocomplete_url(ctx: discord.AutocompleteContext) -> List[discord.OptionChoice]:
+    """선택하면 곡 URL이 입력되는 자동완성 (/재생, /검색)"""
+    results = await suggestion_index.suggest(ctx)
+    return [discord.OptionChoice(name=title[:100], value=url) for title, url in results if len(url) <= 100]
+
+
+async def autocomplete_title(ctx: discord.AutocompleteContext) -> List[discord.OptionChoice]:
+    """선택하면 곡 제목이 입력되는 자동완성 (/노래방 - MR 검색에 제목을 사용)"""
+    results = await suggestion_index.suggest(ctx)
+    return [discord.OptionChoice(name=title[:100], value=title[:100]) for title, _ in results]
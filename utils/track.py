@@ -0,0 +1,151 @@
+"""대기열 곡 정보 (불변 Track + 프로세스 전역 인터닝 카탈로그)"""
+from __future__ import annotations
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+from .resolve_cache import extract_video_id
+
+__all__ = ["Track", "TrackCatalog", "track_catalog"]
+
+_FIELDS = ("id", "url", "title", "duration", "thumbnail", "uploader", "view_count", "start")
+
+
+class Track:
+    """대기열에 들어가는 곡 메타데이터 (변경 불가)
+
+    url은 YouTube 시청 페이지 주소이고, 스트림 URL은 재생 직전에 따로 해석한다.
+    같은 곡은 track_catalog를 거쳐 하나의 객체를 여러 서버가 공유한다.
+    start는 재생을 시작할 위치(초, URL의 t= 값)이며 시작 위치가 다르면 다른 항목이다.
+    """
+
+    __slots__ = _FIELDS + ("__weakref__",)
+
+    def __init__(
+        self,
+        url: str,
+        title: Optional[str] = None,
+        duration: Optional[float] = None,
+        thumbnail: Optional[str] = None,
+        uploader: Optional[str] = None,
+        view_count: Optional[int] = None,
+        id: Optional[str] = None,
+        start: float = 0.0,
+    ) -> None:
+        values = {
+            "id": id or extract_video_id(url),
+            "url": url,
+            "title": title,
+            "duration": duration,
+            "thumbnail": thumbnail,
+            "uploader": uploader,
+            "view_count": view_count,
+            "start": float(start or 0.0),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Track은 변경할 수 없습니다")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Track은 변경할 수 없습니다")
+
+    def __repr__(self) -> str:
+        return f"<Track {self.key} {self.title!r}>"
+
+    @property
+    def key(self) -> str:
+        """카탈로그 키 (비디오 ID, 없으면 URL + 시작 위치)"""
+        key = self.id or self.url
+        return f"{key}@{self.start:g}" if self.start else key
+
+    @property
+    def webpage_url(self) -> str:
+        """재생 소스 객체와 같은 이름으로 접근하기 위한 별칭"""
+        return self.url
+
+    @classmethod
+    def from_info(cls, info: Dict[str, Any]) -> "Track":
+        """yt-dlp info 또는 저장된 재생목록 항목({"webpage_url", "title", ...})에서 생성"""
+        return cls(
+            info.get("webpage_url") or info.get("url"),
+            title=info.get("title"),
+            duration=info.get("duration"),
+            thumbnail=info.get("thumbnail"),
+            uploader=info.get("uploader"),
+            view_count=info.get("view_count"),
+            id=info.get("id"),
+            start=info.get("start") or 0.0,
+        )
+
+    from_dict = from_info
+
+    def at(self, start: float) -> "Track":
+        """start초부터 재생하는 같은 곡"""
+        values = {name: getattr(self, name) for name in _FIELDS}
+        values["start"] = start
+        return Track(**values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """재생목록 JSON 형식 (시작 위치는 있을 때만)"""
+        data = {
+            "webpage_url": self.url,
+            "title": self.title,
+            "duration": self.duration,
+            "thumbnail": self.thumbnail,
+            "uploader": self.uploader,
+            "view_count": self.view_count,
+        }
+        if self.start:
+            data["start"] = self.start
+        return data
+
+    def _missing_from(self, other: "Track") -> bool:
+        """other에만 있는 필드가 있으면 True"""
+        return any(getattr(self, name) is None and getattr(other, name) is not None for name in _FIELDS)
+
+    def _merged(self, other: "Track") -> "Track":
+        values = {name: getattr(self, name) for name in _FIELDS}
+        for name in _FIELDS:
+            if values[name] is None:
+                values[name] = getattr(other, name)
+        return Track(**values)
+
+
+class TrackCatalog:
+    """비디오 ID -> Track 약한 참조 카탈로그
+
+    어느 대기열에서도 쓰지 않는 Track은 자동으로 사라진다. 이미 있는 곡이
+    더 많은 정보와 함께 다시 들어오면 빈 필드를 채운 Track으로 교체한다.
+    """
+
+    def __init__(self) -> None:
+        self._tracks: "weakref.WeakValueDictionary[str, Track]" = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def intern(self, track: Track) -> Track:
+        with self._lock:
+            existing = self._tracks.get(track.key)
+            if existing is not None and not existing._missing_from(track):
+                self.hits += 1
+                return existing
+            self.misses += 1
+            if existing is not None:
+                track = existing._merged(track)
+            self._tracks[track.key] = track
+            return track
+
+    def from_info(self, info: Dict[str, Any]) -> Track:
+        return self.intern(Track.from_info(info))
+
+    def stats(self) -> Dict[str, int]:
+        return {"tracks": len(self._tracks), "hits": self.hits, "misses": self.misses}
+
+
+track_catalog = TrackCatalog()
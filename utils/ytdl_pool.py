@@ -0,0 +1,99 @@
+"""재사용 가능한 YoutubeDL 인스턴스 풀"""
+from __future__ import annotations
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+import yt_dlp
+
+from .constants import EXTRACTION_WORKERS
+
+__all__ = ["YTDLPool", "ytdl_pool"]
+
+logger = logging.getLogger(__name__)
+
+
+class YTDLPool:
+    """옵션 프로필(stream/search/download 등)별 YoutubeDL 풀
+
+    인스턴스는 한 번에 한 스레드만 빌려 쓸 수 있고, 반납되면 추출기/쿠키/
+    HTTP 핸들러(keep-alive 연결 포함)를 그대로 유지한 채 재사용된다.
+    """
+
+    def __init__(self, max_per_profile: int = EXTRACTION_WORKERS) -> None:
+        self.max_per_profile = max(1, max_per_profile)
+        self._options: Dict[str, Dict[str, Any]] = {}
+        self._idle: Dict[str, List[yt_dlp.YoutubeDL]] = {}
+        self._created: Dict[str, int] = {}
+        self._cond = threading.Condition()
+
+    def register(self, profile: str, options: Dict[str, Any]) -> None:
+        """프로필 옵션 등록 (옵션이 바뀌면 기존 유휴 인스턴스는 폐기)"""
+        with self._cond:
+            if self._options.get(profile) == options:
+                return
+            for ydl in self._idle.pop(profile, []):
+                self._close(ydl)
+                self._created[profile] -= 1
+            self._options[profile] = dict(options)
+            self._idle[profile] = []
+            self._created.setdefault(profile, 0)
+
+    @contextmanager
+    def acquire(self, profile: str) -> Iterator[yt_dlp.YoutubeDL]:
+        """프로필 인스턴스 대여 (모두 사용 중이면 반납될 때까지 대기)"""
+        ydl = self._checkout(profile)
+        try:
+            yield ydl
+        finally:
+            with self._cond:
+                self._idle[profile].append(ydl)
+                self._cond.notify()
+
+    def _checkout(self, profile: str) -> yt_dlp.YoutubeDL:
+        with self._cond:
+            if profile not in self._options:
+                raise KeyError(f"등록되지 않은 yt-dlp 프로필: {profile}")
+            while True:
+                idle = self._idle[profile]
+                if idle:
+                    return idle.pop()
+                if self._created[profile] < self.max_per_profile:
+                    self._created[profile] += 1
+                    options = self._options[profile]
+                    break
+                self._cond.wait()
+        try:
+            return yt_dlp.YoutubeDL(options)
+        except Exception:
+            with self._cond:
+                self._created[profile] -= 1
+                self._cond.notify()
+            raise
+
+    @staticmethod
+    def _close(ydl: yt_dlp.YoutubeDL) -> None:
+        try:
+            ydl.close()
+        except Exception as e:
+            logger.debug(f"YoutubeDL 종료 오류: {e}")
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._cond:
+            return {
+                profile: {"created": self._created[profile], "idle": len(self._idle[profile])}
+                for profile in self._options
+            }
+
+    def close(self) -> None:
+        """유휴 인스턴스 정리 (봇 종료 시)"""
+        with self._cond:
+            for profile, idle in self._idle.items():
+                for ydl in idle:
+                    self._close(ydl)
+                self._created[profile] -= len(idle)
+                idle.clear()
+
+
+ytdl_pool = YTDLPool()